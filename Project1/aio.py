@@ -0,0 +1,431 @@
+"""
+This is a set of asyncio stream wrappers that encrypt everything written to a connection and decrypt everything read
+from it with the XOR, Vigenere or Caesar ciphers from encrypt.py, along with an echo server benchmark.
+
+The wrappers work on the bytes going over the connection. XOR works on every byte like XORCipher.xor_bytes, and
+the Vigenere and Caesar ciphers shift the ASCII letters and pass every other byte through, so UTF-8 text comes out
+the same as it went in. The key position carries on from one read or write to the next in each direction.
+
+Run the benchmark with: python aio.py --connections 100 --messages 100 --size 1024 --cipher xor --key gvsu
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import argparse
+import asyncio
+import time
+from encrypt import XORCipher, CaesarCipher, VigenereCipher, caesar_bytes, make_cipher, vigenere_bytes, vigenere_shifts
+
+# Number of bytes read from the connection at a time
+READ_SIZE = 64 * 1024
+
+
+def _transform(cipher_spec, decrypt: bool):
+    """
+    Function that turns a cipher into a function of (data, position) for the bytes of a connection
+    :param
+    cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, as accepted by make_cipher
+    :param
+    decrypt: Whether to decrypt instead of encrypting
+    :return:
+    A function taking the bytes and the position of their first byte in the stream, and returning the new bytes
+    """
+    cipher = make_cipher(cipher_spec)
+
+    if isinstance(cipher, XORCipher):
+        if not cipher.key:
+            raise ValueError('Key must not be empty')
+        return cipher.xor_bytes
+    if isinstance(cipher, VigenereCipher):
+        if not cipher.key:
+            raise ValueError('Key must not be empty')
+        shifts = vigenere_shifts(cipher.key, decrypt)
+        return lambda data, position: vigenere_bytes(data, shifts, position)
+    if isinstance(cipher, CaesarCipher):
+        shift = -cipher.key if decrypt else cipher.key
+        return lambda data, position: caesar_bytes(data, shift)
+
+    raise ValueError('Only the xor, vigenere and caesar ciphers can encrypt a stream of bytes')
+
+
+class EncryptedStreamReader:
+    """
+    Wrapper around an asyncio.StreamReader that decrypts everything read from it
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, cipher_spec) -> None:
+        """
+        Constructor method that takes in the reader and the cipher
+        :param
+        reader: The asyncio.StreamReader of the connection
+        :param
+        cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, as accepted by make_cipher
+        """
+        self.reader = reader
+        self._decrypt = _transform(cipher_spec, True)
+        # Number of bytes decrypted so far, which is the key position of the next byte
+        self.position = 0
+        # Decrypted bytes that have been read from the connection but not returned yet
+        self._buffer = bytearray()
+
+    async def _fill(self, size: int = READ_SIZE) -> bool:
+        """
+        Method that reads more bytes from the connection and decrypts them into the buffer
+        :param
+        size: The most bytes to read
+        :return:
+        False if the connection has ended, True otherwise
+        """
+        data = await self.reader.read(size)
+        if not data:
+            return False
+
+        self._buffer += self._decrypt(data, self.position)
+        self.position += len(data)
+        return True
+
+    async def read(self, n: int = -1) -> bytes:
+        """
+        Method that reads and decrypts up to n bytes, like StreamReader.read
+        :param
+        n: The most bytes to return, or -1 to read until the connection ends
+        :return:
+        The decrypted bytes, which are empty once the connection has ended
+        """
+        if n < 0:
+            while await self._fill():
+                pass
+        elif not self._buffer:
+            await self._fill(n)
+
+        if n < 0 or n >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:n])
+            del self._buffer[:n]
+        return data
+
+    async def readexactly(self, n: int) -> bytes:
+        """
+        Method that reads and decrypts exactly n bytes, like StreamReader.readexactly
+        :param
+        n: The number of bytes to return
+        :return:
+        The decrypted bytes
+        """
+        while len(self._buffer) < n:
+            if not await self._fill(max(READ_SIZE, n - len(self._buffer))):
+                partial = bytes(self._buffer)
+                self._buffer.clear()
+                raise asyncio.IncompleteReadError(partial, n)
+
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data
+
+    async def readline(self) -> bytes:
+        """
+        Method that reads and decrypts up to and including the next newline, like StreamReader.readline
+        :return:
+        The decrypted line, or whatever is left if the connection ends first
+        """
+        end = self._buffer.find(b'\n')
+        while end < 0:
+            searched = len(self._buffer)
+            if not await self._fill():
+                end = len(self._buffer) - 1
+                break
+            found = self._buffer.find(b'\n', searched)
+            end = found
+
+        data = bytes(self._buffer[:end + 1])
+        del self._buffer[:end + 1]
+        return data
+
+    def at_eof(self) -> bool:
+        """
+        Method that checks whether everything has been read, like StreamReader.at_eof
+        :return:
+        True if the connection has ended and nothing is left to return
+        """
+        return not self._buffer and self.reader.at_eof()
+
+
+class EncryptedStreamWriter:
+    """
+    Wrapper around an asyncio.StreamWriter that encrypts everything written to it
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, cipher_spec) -> None:
+        """
+        Constructor method that takes in the writer and the cipher
+        :param
+        writer: The asyncio.StreamWriter of the connection
+        :param
+        cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, as accepted by make_cipher
+        """
+        self.writer = writer
+        self._encrypt = _transform(cipher_spec, False)
+        # Number of bytes encrypted so far, which is the key position of the next byte
+        self.position = 0
+
+    def write(self, data) -> None:
+        """
+        Method that encrypts bytes and writes them to the connection, like StreamWriter.write
+        :param
+        data: A bytes-like object
+        """
+        self.writer.write(self._encrypt(data, self.position))
+        self.position += len(data)
+
+    def writelines(self, data) -> None:
+        """
+        Method that encrypts and writes several bytes objects, like StreamWriter.writelines
+        :param
+        data: Any iterable of bytes-like objects
+        """
+        self.write(b''.join(data))
+
+    async def drain(self) -> None:
+        """
+        Method that waits until it is fine to write again, like StreamWriter.drain
+        """
+        await self.writer.drain()
+
+    def write_eof(self) -> None:
+        """
+        Method that closes the writing side of the connection, like StreamWriter.write_eof
+        """
+        self.writer.write_eof()
+
+    def close(self) -> None:
+        """
+        Method that closes the connection, like StreamWriter.close
+        """
+        self.writer.close()
+
+    def is_closing(self) -> bool:
+        """
+        Method that checks whether the connection is closed or closing, like StreamWriter.is_closing
+        :return:
+        True if it is closing
+        """
+        return self.writer.is_closing()
+
+    async def wait_closed(self) -> None:
+        """
+        Method that waits until the connection is closed, like StreamWriter.wait_closed
+        """
+        await self.writer.wait_closed()
+
+    def get_extra_info(self, name: str, default=None):
+        """
+        Method that looks up information about the connection, like StreamWriter.get_extra_info
+        :param
+        name: The name of the information, such as 'peername'
+        :param
+        default: What to return if it is not available
+        :return:
+        The information
+        """
+        return self.writer.get_extra_info(name, default)
+
+
+def wrap_streams(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, cipher_spec) -> tuple:
+    """
+    Function that wraps both streams of a connection with the same cipher
+    :param
+    reader: The asyncio.StreamReader of the connection
+    :param
+    writer: The asyncio.StreamWriter of the connection
+    :param
+    cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, as accepted by make_cipher
+    :return:
+    An (EncryptedStreamReader, EncryptedStreamWriter) pair
+    """
+    return EncryptedStreamReader(reader, cipher_spec), EncryptedStreamWriter(writer, cipher_spec)
+
+
+async def open_encrypted_connection(host: str, port: int, cipher_spec, **kwargs) -> tuple:
+    """
+    Function that opens a connection whose traffic is encrypted, like asyncio.open_connection
+    :param
+    host: The host to connect to
+    :param
+    port: The port to connect to
+    :param
+    cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, as accepted by make_cipher
+    :param
+    kwargs: Any other arguments for asyncio.open_connection
+    :return:
+    An (EncryptedStreamReader, EncryptedStreamWriter) pair
+    """
+    # Check the cipher before connecting, so a bad spec does not leave a connection open
+    _transform(cipher_spec, False)
+    reader, writer = await asyncio.open_connection(host, port, **kwargs)
+    return wrap_streams(reader, writer, cipher_spec)
+
+
+async def start_encrypted_server(client_connected_cb, host: str, port: int, cipher_spec, **kwargs):
+    """
+    Function that starts a server whose traffic is encrypted, like asyncio.start_server
+    :param
+    client_connected_cb: The coroutine function called with an (EncryptedStreamReader, EncryptedStreamWriter) pair
+    for each new connection
+    :param
+    host: The host to listen on
+    :param
+    port: The port to listen on, or 0 to pick a free one
+    :param
+    cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, as accepted by make_cipher
+    :param
+    kwargs: Any other arguments for asyncio.start_server
+    :return:
+    The asyncio.Server
+    """
+    _transform(cipher_spec, False)
+
+    async def connected(reader, writer):
+        await client_connected_cb(*wrap_streams(reader, writer, cipher_spec))
+
+    return await asyncio.start_server(connected, host, port, **kwargs)
+
+
+async def _echo(reader, writer) -> None:
+    """
+    Coroutine that sends everything it reads straight back, for the benchmark's server
+    :param
+    reader: The reader of the connection
+    :param
+    writer: The writer of the connection
+    """
+    try:
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    """
+    Function that picks a percentile out of sorted values
+    :param
+    ordered: The values, sorted from smallest to largest
+    :param
+    fraction: The percentile as a fraction, such as 0.99
+    :return:
+    The value at that percentile
+    """
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def benchmark_echo(cipher_spec=None, connections: int = 100, messages: int = 100,
+                         message_size: int = 1024) -> dict:
+    """
+    Coroutine that measures an encrypted echo server on this machine, with many clients sending messages at once.
+    Each client sends a message, waits for all of it to come back, and then sends the next one.
+    :param
+    cipher_spec: A spec for XORCipher, VigenereCipher or CaesarCipher, or None to measure unencrypted streams
+    :param
+    connections: The number of clients connected at once
+    :param
+    messages: The number of messages each client sends
+    :param
+    message_size: The number of bytes in each message
+    :return:
+    A dictionary with the throughput in megabytes per second of messages echoed, and the round trip latency in
+    milliseconds
+    """
+    for name, value in (('Connections', connections), ('Messages', messages), ('Message size', message_size)):
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(name + ' must be a positive int')
+
+    if cipher_spec is None:
+        server = await asyncio.start_server(_echo, '127.0.0.1', 0)
+    else:
+        server = await start_encrypted_server(_echo, '127.0.0.1', 0, cipher_spec)
+    port = server.sockets[0].getsockname()[1]
+    message = (b'Go Lakers! ' * (message_size // 11 + 1))[:message_size]
+    latencies = []
+
+    async def client():
+        if cipher_spec is None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        else:
+            reader, writer = await open_encrypted_connection('127.0.0.1', port, cipher_spec)
+        try:
+            for _ in range(messages):
+                started = time.perf_counter()
+                writer.write(message)
+                await writer.drain()
+                if await reader.readexactly(message_size) != message:
+                    raise ValueError('The echo did not match the message')
+                latencies.append(time.perf_counter() - started)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async with server:
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(connections)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'connections': connections,
+        'messages': connections * messages,
+        'seconds': elapsed,
+        'megabytes_per_second': connections * messages * message_size / elapsed / (1024 * 1024),
+        'latency_mean_ms': sum(latencies) / len(latencies) * 1000,
+        'latency_p50_ms': _percentile(latencies, 0.5) * 1000,
+        'latency_p99_ms': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv: list = None) -> None:
+    """
+    Function that runs the echo server benchmark from the command line and prints the results
+    :param
+    argv: The command line arguments, or None to use sys.argv
+    """
+    parser = argparse.ArgumentParser(description='Benchmark an encrypted echo server on this machine.')
+    parser.add_argument('--cipher', choices=('none', 'xor', 'vigenere', 'caesar'), default='xor',
+                        help='the cipher to use, or none for unencrypted streams (default xor)')
+    parser.add_argument('--key', default='gvsu', help='the key, a whole number for caesar (default gvsu)')
+    parser.add_argument('--connections', type=int, default=100, help='clients connected at once (default 100)')
+    parser.add_argument('--messages', type=int, default=100, help='messages sent by each client (default 100)')
+    parser.add_argument('--size', type=int, default=1024, help='bytes in each message (default 1024)')
+    arguments = parser.parse_args(argv)
+
+    cipher_spec = None
+    if arguments.cipher != 'none':
+        key = arguments.key
+        if arguments.cipher == 'caesar':
+            try:
+                key = int(key)
+            except ValueError:
+                parser.error('caesar needs a whole number --key')
+        cipher_spec = (arguments.cipher, key)
+
+    try:
+        result = asyncio.run(benchmark_echo(cipher_spec, arguments.connections, arguments.messages, arguments.size))
+    except ValueError as error:
+        parser.error(str(error))
+
+    print('{messages} messages over {connections} connections in {seconds:.2f} s'.format(**result))
+    print('throughput {megabytes_per_second:.1f} MB/s'.format(**result))
+    print('latency mean {latency_mean_ms:.2f} ms, p50 {latency_p50_ms:.2f} ms, p99 {latency_p99_ms:.2f} ms'
+          .format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+"""
+This is a benchmark suite for the ciphers in encrypt.py. Every cipher is timed encrypting and decrypting ASCII text
+and text with non-ASCII characters at sizes from 1 KB to 100 MB. The results can be saved as JSON and compared with
+a saved baseline, and the run fails when any timing is slower than the baseline by more than the tolerance.
+
+Run the whole suite and save it as the baseline with: python benchmark.py --save-baseline
+Check a change against that baseline with: python benchmark.py --baseline benchmark_baseline.json
+A quick run up to 1 MB: python benchmark.py --quick
+Compare the ASCII fast paths with character by character loops: python benchmark.py --fast-paths
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from encrypt import XORCipher, CaesarCipher, VigenereCipher, CustomMappingCipher, make_cipher, vigenere_shifts, np
+
+# The ASCII sample repeated to make the benchmark text, and the characters mixed in to make the Unicode text
+ASCII_SAMPLE = 'Four score and seven years ago our fathers brought forth on this continent, a new nation. '
+UNICODE_EXTRAS = '— € ★ '
+
+# The cipher spec used for each cipher in the suite
+SUITE_CIPHERS = {
+    'salting': ('salting', 'gvsulakers'),
+    'reverse1': ('reverse1',),
+    'reverse2': ('reverse2',),
+    'xor': ('xor', 'gvsu'),
+    'caesar': ('caesar', 3),
+    'vigenere': ('vigenere', 'lakers'),
+    'mapping': ('mapping',),
+}
+
+# Text sizes in characters, the sizes used by --quick, and the kinds of text
+SIZES = (1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024, 100 * 1024 * 1024)
+QUICK_SIZES = (1024, 100 * 1024, 1024 * 1024)
+MIXES = ('ascii', 'unicode')
+
+# Small timings are repeated in a loop until the loop takes at least this many seconds, to smooth out timer noise
+MIN_LOOP_TIME = 0.05
+
+# How much slower than the baseline a timing may be before it counts as a regression
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+
+def make_text(size: int, unicode: bool = False) -> str:
+    """
+    Function that makes benchmark text of a given length
+    :param
+    size: The number of characters
+    :param
+    unicode: Whether to mix in non-ASCII characters
+    :return:
+    The text
+    """
+    sample = ASCII_SAMPLE + UNICODE_EXTRAS if unicode else ASCII_SAMPLE
+    return (sample * (size // len(sample) + 1))[:size]
+
+
+def best_time(function, text: str, repeat: int) -> float:
+    """
+    Function that times a function on some text a few times and keeps the quickest run.
+    Quick calls are run several times in a loop and the loop time is divided by the number of calls.
+    :param
+    function: The function to time, which takes the text
+    :param
+    text: The string input to pass it
+    :param
+    repeat: The number of runs
+    :return:
+    The quickest time for one call in seconds
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function(text)
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_LOOP_TIME:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            function(text)
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def result_name(cipher: str, operation: str, mix: str, size: int) -> str:
+    """
+    Function that names one timing of the suite, which is how it is matched up with the baseline
+    :param
+    cipher: The cipher name
+    :param
+    operation: Either 'encrypt' or 'decrypt'
+    :param
+    mix: Either 'ascii' or 'unicode'
+    :param
+    size: The number of characters
+    :return:
+    The name, like 'caesar/encrypt/ascii/1024'
+    """
+    return '/'.join((cipher, operation, mix, str(size)))
+
+
+def run_suite(ciphers=tuple(SUITE_CIPHERS), sizes=SIZES, mixes=MIXES, repeat: int = 3, report=None) -> dict:
+    """
+    Function that times every cipher encrypting and decrypting every kind and size of text
+    :param
+    ciphers: The names of the ciphers to time
+    :param
+    sizes: The text sizes in characters
+    :param
+    mixes: The kinds of text, from MIXES
+    :param
+    repeat: The number of runs of each timing, of which the quickest is kept
+    :param
+    report: A function called with the name, seconds and characters per second of each timing as it finishes,
+    or None
+    :return:
+    A dictionary describing the machine, with a 'results' dictionary from result names to seconds per call
+    """
+    results = {}
+
+    for size in sizes:
+        for mix in mixes:
+            text = make_text(size, unicode=mix == 'unicode')
+            for name in ciphers:
+                cipher = make_cipher(SUITE_CIPHERS[name])
+                cipher_text = cipher.encrypt(text)
+                for operation, function, argument in (('encrypt', cipher.encrypt, text),
+                                                      ('decrypt', cipher.decrypt, cipher_text)):
+                    seconds = best_time(function, argument, repeat)
+                    results[result_name(name, operation, mix, size)] = seconds
+                    if report is not None:
+                        report(result_name(name, operation, mix, size), seconds, size / seconds)
+                del cipher_text
+
+    return {
+        'python': platform.python_version(),
+        'numpy': None if np is None else np.__version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'results': results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Function that compares suite results with a baseline
+    :param
+    results: The dictionary made by run_suite
+    :param
+    baseline: An earlier dictionary made by run_suite
+    :param
+    tolerance: How much slower a timing may be, as a fraction of the baseline time
+    :return:
+    A list of (name, baseline seconds, seconds) triples for every timing that got slower than the tolerance allows,
+    slowest first. Timings missing from either side are skipped.
+    """
+    if tolerance < 0:
+        raise ValueError('Tolerance must not be negative')
+
+    regressions = []
+    for name, seconds in results['results'].items():
+        before = baseline['results'].get(name)
+        if before is not None and seconds > before * (1 + tolerance):
+            regressions.append((name, before, seconds))
+
+    regressions.sort(key=lambda regression: regression[2] / regression[1], reverse=True)
+    return regressions
+
+
+def _shift_character(char: str, shift: int) -> str:
+    """
+    Function that shifts one character the way the Caesar and Vigenere ciphers do, as the character by character
+    reference for the fast paths
+    :param
+    char: The character to shift
+    :param
+    shift: The number of places to shift it by
+    :return:
+    The shifted character, or the character itself if it is not a letter
+    """
+    if char.isupper():
+        return chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
+    if char.islower():
+        return chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
+    return char
+
+
+def _vigenere_characters(text: str, shifts: tuple) -> str:
+    """
+    Function that applies Vigenere shifts one character at a time, as the reference for the fast path
+    :param
+    text: The string input being shifted
+    :param
+    shifts: The shift for each key position, from vigenere_shifts
+    :return:
+    The shifted text
+    """
+    return ''.join(_shift_character(char, shifts[i % len(shifts)]) for i, char in enumerate(text))
+
+
+def benchmark_cases() -> list:
+    """
+    Function that lists the ciphers with an ASCII fast path to compare
+    :return:
+    A list of (name, fast function, character path function) triples
+    """
+    xor = XORCipher('', 'gvsu')
+    mapping = CustomMappingCipher('')
+    shifts = vigenere_shifts('lakers')
+    return [
+        ('caesar', CaesarCipher('', 3).encrypt, lambda text: ''.join(_shift_character(char, 3) for char in text)),
+        ('vigenere', VigenereCipher('', 'lakers').encrypt, lambda text: _vigenere_characters(text, shifts)),
+        ('xor', xor.encrypt, lambda text: xor.xor_words(text, xor.key)),
+        ('mapping', mapping.encrypt, lambda text: ''.join(mapping.character_map.get(char, char) for char in text)),
+    ]
+
+
+def run_fast_path_benchmarks(size: int, repeat: int = 3) -> list:
+    """
+    Function that times the ASCII fast paths against character by character loops and against Unicode text
+    :param
+    size: The number of characters of text each cipher is timed on
+    :param
+    repeat: The number of runs of each timing, of which the quickest is kept
+    :return:
+    A list with a dictionary of results for each cipher, with speeds in millions of characters per second
+    """
+    ascii_text = make_text(size)
+    unicode_text = make_text(size, unicode=True)
+    results = []
+
+    for name, fast, character_path in benchmark_cases():
+        fast_time = best_time(fast, ascii_text, repeat)
+        character_time = best_time(character_path, ascii_text, repeat)
+        unicode_time = best_time(fast, unicode_text, repeat)
+        results.append({
+            'cipher': name,
+            'ascii': size / fast_time / 1e6,
+            'ascii_character_path': size / character_time / 1e6,
+            'unicode': size / unicode_time / 1e6,
+            'speedup': character_time / fast_time,
+        })
+
+    return results
+
+
+def _print_fast_paths(size: int, repeat: int) -> None:
+    """
+    Function that prints a table of the fast path benchmarks
+    :param
+    size: The number of characters of text each cipher is timed on
+    :param
+    repeat: The number of runs of each timing
+    """
+    print('Millions of characters per second for', size, 'characters')
+    print('{:<10}{:>12}{:>18}{:>12}{:>10}'.format('cipher', 'ascii', 'ascii char path', 'unicode', 'speedup'))
+    for result in run_fast_path_benchmarks(size, repeat):
+        print('{cipher:<10}{ascii:>12.1f}{ascii_character_path:>18.1f}{unicode:>12.1f}{speedup:>9.1f}x'
+              .format(**result))
+
+
+def main(argv: list = None) -> int:
+    """
+    Function that runs the benchmark suite from the command line
+    :param
+    argv: The command line arguments, or None to use sys.argv
+    :return:
+    The exit status, which is 1 when a timing regressed against the baseline
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the ciphers and check for slowdowns.')
+    parser.add_argument('--ciphers', nargs='+', choices=list(SUITE_CIPHERS), default=list(SUITE_CIPHERS),
+                        help='ciphers to time (default all)')
+    parser.add_argument('--sizes', nargs='+', type=int, help='text sizes in characters (default 1 KB to 100 MB)')
+    parser.add_argument('--quick', action='store_true', help='only time sizes up to 1 MB')
+    parser.add_argument('--mixes', nargs='+', choices=MIXES, default=list(MIXES), help='kinds of text (default both)')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs of each timing (default 3)')
+    parser.add_argument('--output', help='file to write the results to as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help='write the results as the new baseline (default ' + DEFAULT_BASELINE + ')')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='fraction slower than the baseline that still passes (default 0.10)')
+    parser.add_argument('--fast-paths', action='store_true',
+                        help='compare the ASCII fast paths with character loops instead of running the suite')
+    arguments = parser.parse_args(argv)
+
+    if arguments.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    if arguments.tolerance < 0:
+        parser.error('--tolerance must not be negative')
+
+    if arguments.fast_paths:
+        _print_fast_paths(max(arguments.sizes or [1000000]), arguments.repeat)
+        return 0
+
+    baseline = None
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+
+    sizes = arguments.sizes or (QUICK_SIZES if arguments.quick else SIZES)
+
+    def report(name, seconds, speed):
+        print('{:<36}{:>14.6f} s{:>10.1f} M chars/s'.format(name, seconds, speed / 1e6), flush=True)
+
+    results = run_suite(arguments.ciphers, sizes, arguments.mixes, arguments.repeat, report)
+
+    for path in (arguments.output, arguments.save_baseline):
+        if path is not None:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent=2, sort_keys=True)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, arguments.tolerance)
+    for name, before, seconds in regressions:
+        print('REGRESSION {}: {:.6f} s -> {:.6f} s ({:+.0%})'.format(name, before, seconds, seconds / before - 1),
+              file=sys.stderr)
+    if regressions:
+        print('{} of {} timings are more than {:.0%} slower than {}'.format(
+            len(regressions), len(results['results']), arguments.tolerance, arguments.baseline), file=sys.stderr)
+        return 1
+
+    print('No timings are more than {:.0%} slower than {}'.format(arguments.tolerance, arguments.baseline))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
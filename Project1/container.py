@@ -0,0 +1,310 @@
+"""
+This is a container file format for storing many records encrypted with one of the ciphers from encrypt.py, with an
+index at the end of the file so any record can be found and decrypted on its own.
+
+The layout of a container file is:
+    header:  magic, format version, cipher name and key id
+    records: for each record, its length followed by its encrypted UTF-8 bytes
+    index:   the file offset of every record
+    footer:  the file offset of the index, the number of records, and an end marker
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from encrypt import CIPHERS, make_cipher
+from parallel import encrypt_many
+
+MAGIC = b'GVSUCT'
+END_MARKER = b'GVIX'
+FORMAT_VERSION = 1
+
+# Magic, format version, then the lengths of the cipher name and the key id
+_HEADER = struct.Struct('<6sHHH')
+# Length of a record
+_RECORD_LENGTH = struct.Struct('<I')
+# One entry of the index
+_INDEX_ENTRY = struct.Struct('<Q')
+# Offset of the index, number of records, end marker
+_FOOTER = struct.Struct('<QQ4s')
+
+
+def _encode(text: str) -> bytes:
+    """
+    Function that turns encrypted text into the bytes stored in the file
+    :param
+    text: The encrypted text, which may hold any code point that the XOR cipher can produce
+    :return:
+    The UTF-8 bytes of the text
+    """
+    return text.encode('utf-8', 'surrogatepass')
+
+
+class ContainerWriter:
+    def __init__(self, path: str, cipher_name: str, key=None, key_id: str = '') -> None:
+        """
+        Constructor method that creates the container file and writes its header
+        :param
+        path: The path of the container file, which is overwritten if it exists
+        :param
+        cipher_name: The name of the cipher in CIPHERS that every record is encrypted with
+        :param
+        key: The cipher's key or salt, or None for the ciphers that do not take one
+        :param
+        key_id: A name for the key that is stored in the header, so a reader can tell which key it needs
+        """
+        if cipher_name not in CIPHERS:
+            raise ValueError('Cipher name must be one of ' + ', '.join(CIPHERS))
+        if not isinstance(key_id, str):
+            raise TypeError('Key id must be a string')
+
+        self.cipher_spec = (cipher_name,) if key is None else (cipher_name, key)
+        self._cipher = make_cipher(self.cipher_spec)
+        self._offsets = array('Q')
+
+        name_bytes = cipher_name.encode('utf-8')
+        key_id_bytes = key_id.encode('utf-8')
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(name_bytes), len(key_id_bytes)))
+        self._file.write(name_bytes + key_id_bytes)
+
+    def _write_records(self, encrypted_records) -> int:
+        """
+        Method that frames encrypted records and writes them all with a single write
+        :param
+        encrypted_records: Any iterable of encrypted text
+        :return:
+        The number of records written
+        """
+        if self._file is None:
+            raise ValueError('Container is closed')
+
+        position = self._file.tell()
+        frames = []
+        for text in encrypted_records:
+            data = _encode(text)
+            self._offsets.append(position)
+            frames.append(_RECORD_LENGTH.pack(len(data)))
+            frames.append(data)
+            position += _RECORD_LENGTH.size + len(data)
+
+        self._file.write(b''.join(frames))
+        return len(frames) // 2
+
+    def append(self, text: str) -> int:
+        """
+        Method that encrypts one record and adds it to the container
+        :param
+        text: The string input to store
+        :return:
+        The index of the new record
+        """
+        if not isinstance(text, str):
+            raise TypeError('Text must be a string')
+
+        self._write_records([self._cipher.encrypt(text)])
+        return len(self._offsets) - 1
+
+    def extend(self, records, workers: int = 1) -> int:
+        """
+        Method that encrypts a batch of records and adds them to the container
+        :param
+        records: Any iterable of strings
+        :param
+        workers: The number of worker processes used to encrypt the records, as in encrypt_many
+        :return:
+        The number of records added
+        """
+        records = list(records)
+        for text in records:
+            if not isinstance(text, str):
+                raise TypeError('Records must be strings')
+
+        return self._write_records(encrypt_many(records, self._cipher, workers=workers))
+
+    def close(self) -> None:
+        """
+        Method that writes the index and footer, then closes the file
+        """
+        if self._file is None:
+            return
+
+        # The index is stored little-endian like the rest of the file
+        index = array('Q', self._offsets)
+        if sys.byteorder == 'big':
+            index.byteswap()
+
+        index_offset = self._file.tell()
+        self._file.write(index.tobytes())
+        self._file.write(_FOOTER.pack(index_offset, len(self._offsets), END_MARKER))
+        self._file.close()
+        self._file = None
+
+    def __len__(self) -> int:
+        """
+        Built-in python method to return the number of records written so far
+        :return:
+        The number of records
+        """
+        return len(self._offsets)
+
+    def __enter__(self) -> 'ContainerWriter':
+        """
+        Built-in python method that lets the writer be used in a with statement
+        :return:
+        The writer itself
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Built-in python method that closes the writer at the end of a with statement
+        """
+        self.close()
+
+
+class ContainerReader:
+    def __init__(self, path: str, key=None) -> None:
+        """
+        Constructor method that memory-maps a container file and reads its header and footer
+        :param
+        path: The path of the container file
+        :param
+        key: The cipher's key or salt, or a dictionary from key ids to keys, or None for ciphers without a key
+        """
+        self._file = open(path, 'rb')
+        self._data = None
+        try:
+            self._open(key)
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, key) -> None:
+        """
+        Method that memory-maps the file, checks its header and footer, and builds the cipher
+        :param
+        key: The cipher's key or salt, or a dictionary from key ids to keys, or None for ciphers without a key
+        """
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size + _FOOTER.size:
+            raise ValueError('File is not a container')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, name_length, key_id_length = _HEADER.unpack_from(self._data, 0)
+        index_offset, count, end_marker = _FOOTER.unpack_from(self._data, len(self._data) - _FOOTER.size)
+        if magic != MAGIC or end_marker != END_MARKER:
+            raise ValueError('File is not a container')
+        if version != FORMAT_VERSION:
+            raise ValueError('Unsupported container version ' + str(version))
+
+        name_start = _HEADER.size
+        records_start = name_start + name_length + key_id_length
+        # The index has to sit between the header and the footer, or the file has been cut short
+        if index_offset < records_start or index_offset + count * _INDEX_ENTRY.size > len(self._data) - _FOOTER.size:
+            raise ValueError('Container index is out of range, so the file is damaged or truncated')
+
+        self.cipher_name = self._data[name_start:name_start + name_length].decode('utf-8')
+        self.key_id = self._data[name_start + name_length:records_start].decode('utf-8')
+        self._index_offset = index_offset
+        self._count = count
+
+        if isinstance(key, dict):
+            if self.key_id not in key:
+                raise KeyError('No key given for key id ' + repr(self.key_id))
+            key = key[self.key_id]
+
+        if key is not None:
+            self._cipher = make_cipher((self.cipher_name, key))
+            return
+        try:
+            self._cipher = make_cipher((self.cipher_name,))
+        except TypeError:
+            raise ValueError('The ' + self.cipher_name + ' cipher needs a key') from None
+
+    def _index(self, number: int) -> int:
+        """
+        Method that checks a record number, allowing negative numbers from the end like a list
+        :param
+        number: The record number
+        :return:
+        The record number counted from the start
+        """
+        if not isinstance(number, int):
+            raise TypeError('Record number must be an int')
+        if number < 0:
+            number += self._count
+        if not 0 <= number < self._count:
+            raise IndexError('Record number out of range')
+        return number
+
+    def raw(self, number: int) -> bytes:
+        """
+        Method that looks up a record's encrypted bytes through the index, without decrypting them
+        :param
+        number: The record number
+        :return:
+        The encrypted UTF-8 bytes of the record
+        """
+        number = self._index(number)
+        (offset,) = _INDEX_ENTRY.unpack_from(self._data, self._index_offset + number * _INDEX_ENTRY.size)
+        (length,) = _RECORD_LENGTH.unpack_from(self._data, offset)
+        start = offset + _RECORD_LENGTH.size
+        return self._data[start:start + length]
+
+    def __getitem__(self, number: int) -> str:
+        """
+        Built-in python method that decrypts a single record
+        :param
+        number: The record number
+        :return:
+        The decrypted record
+        """
+        return self._cipher.decrypt(self.raw(number).decode('utf-8', 'surrogatepass'))
+
+    def __len__(self) -> int:
+        """
+        Built-in python method to return the number of records
+        :return:
+        The number of records
+        """
+        return self._count
+
+    def __iter__(self):
+        """
+        Built-in python method that decrypts the records one at a time, in order
+        :return:
+        Yields each decrypted record
+        """
+        for number in range(self._count):
+            yield self[number]
+
+    def close(self) -> None:
+        """
+        Method that unmaps and closes the container file
+        """
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def __enter__(self) -> 'ContainerReader':
+        """
+        Built-in python method that lets the reader be used in a with statement
+        :return:
+        The reader itself
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Built-in python method that closes the reader at the end of a with statement
+        """
+        self.close()
@@ -0,0 +1,600 @@
+"""
+This is a set of tools for recovering the keys of text encrypted with the ciphers from encrypt.py.
+Everything here works on NumPy arrays of letter counts instead of looping over the text, so it needs NumPy installed.
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# How often each letter a-z appears in English text, in percent
+ENGLISH_FREQUENCIES = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]) / 100
+
+# Index of coincidence of text where every letter is equally likely
+RANDOM_IOC = 1 / 26
+
+# Longest Vigenere key tried when guessing the key length
+MAX_VIGENERE_KEY_LENGTH = 40
+
+# Number of letters looked at when guessing the key length, which is plenty for a stable index of coincidence
+KEY_LENGTH_SAMPLE = 200000
+
+# Longest XOR key tried when guessing the key size, and the number of bytes looked at to guess it
+MAX_XOR_KEY_SIZE = 40
+KEY_SIZE_SAMPLE = 256 * 1024
+
+# Number of bits set in each byte value
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# Item [b, v] is v XOR b, for trying every key byte b on every byte value v at once
+_XORED_BYTES = np.arange(256)[:, None] ^ np.arange(256)[None, :]
+
+
+def _english_byte_weights() -> np.ndarray:
+    """
+    Function that builds a rough log-probability of each byte value appearing in English text
+    :return:
+    An array of 256 log-probabilities
+    """
+    probabilities = np.full(256, 1e-6)
+    probabilities[32:127] = 1e-3
+    probabilities[[ord('\t'), ord('\n'), ord('\r')]] = 5e-3
+    probabilities[[ord('.'), ord(','), ord("'"), ord('-')]] = 1e-2
+    probabilities[ord(' ')] = 0.15
+    probabilities[ord('a'):ord('z') + 1] = ENGLISH_FREQUENCIES * 0.75
+    probabilities[ord('A'):ord('Z') + 1] = ENGLISH_FREQUENCIES * 0.05
+    return np.log(probabilities)
+
+
+_ENGLISH_BYTE_WEIGHTS = _english_byte_weights()
+
+# Row k holds the letter indexes (k + j) % 26 for j = 0-25, for rolling a histogram by every shift at once
+_SHIFTED_LETTERS = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+
+
+def letter_codes(text: str) -> np.ndarray:
+    """
+    Function that turns text into an array of letter numbers, ignoring case
+    :param
+    text: The string input to look at
+    :return:
+    An array with 0-25 for each ASCII letter of the text and -1 for every other character
+    """
+    if text.isascii():
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8).astype(np.int32)
+    else:
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.int64)
+
+    # Setting the 0x20 bit turns an upper case ASCII letter into the lower case one
+    letters = (codes | 0x20) - ord('a')
+    is_letter = ((codes >= ord('A')) & (codes <= ord('Z'))) | ((codes >= ord('a')) & (codes <= ord('z')))
+    return np.where(is_letter, letters, -1)
+
+
+def letter_histogram(text: str) -> np.ndarray:
+    """
+    Function that counts how often each letter appears in text, ignoring case
+    :param
+    text: The string input to count
+    :return:
+    An array of 26 counts, for a to z
+    """
+    codes = letter_codes(text)
+    return np.bincount(codes[codes >= 0], minlength=26)
+
+
+def crack_caesar(cipher_text: str) -> list:
+    """
+    Function that ranks every possible key for text encrypted with CaesarCipher.
+    The letters are counted once, and the count for each of the 26 shifts is made by rolling that histogram,
+    so the text is never decrypted. Each shift is scored by how far its letter counts are from English with the
+    chi-squared statistic, where lower is better.
+    :param
+    cipher_text: The text encrypted with CaesarCipher
+    :return:
+    A list of (key, score) pairs for the keys 0-25, best key first
+    """
+    if not isinstance(cipher_text, str):
+        raise TypeError('Cipher text must be a string')
+
+    histogram = letter_histogram(cipher_text)
+    total = histogram.sum()
+    if total == 0:
+        raise ValueError('Cipher text has no letters to score')
+
+    # Row k is the letter count the plain text would have if the key were k
+    shifted = histogram[_SHIFTED_LETTERS]
+    expected = ENGLISH_FREQUENCIES * total
+    scores = ((shifted - expected) ** 2 / expected).sum(axis=1)
+
+    return [(int(key), float(scores[key])) for key in np.argsort(scores, kind='stable')]
+
+
+def _letter_positions(cipher_text: str, limit: int = None) -> tuple:
+    """
+    Function that finds every letter of the text and where it is
+    :param
+    cipher_text: The string input to look at
+    :param
+    limit: The most letters to return, or None for all of them
+    :return:
+    A (positions, letters) pair of arrays, holding the position of each letter in the text and its number 0-25
+    """
+    codes = letter_codes(cipher_text)
+    positions = np.flatnonzero(codes >= 0)[:limit]
+    return positions, codes[positions]
+
+
+def _column_counts(positions: np.ndarray, letters: np.ndarray, key_length: int) -> np.ndarray:
+    """
+    Function that counts the letters at each key position separately
+    :param
+    positions: The position of each letter in the text
+    :param
+    letters: The number 0-25 of each letter
+    :param
+    key_length: The number of key positions
+    :return:
+    A (key_length, 26) array, where row c counts the letters whose position is c modulo key_length
+    """
+    columns = positions % key_length
+    return np.bincount(columns * 26 + letters, minlength=key_length * 26).reshape(key_length, 26)
+
+
+def vigenere_key_length_scores(cipher_text: str, max_key_length: int = MAX_VIGENERE_KEY_LENGTH) -> np.ndarray:
+    """
+    Function that scores every candidate key length for text encrypted with VigenereCipher.
+    The letters at each key position were all shifted by the same amount when the length is right, so they keep the
+    index of coincidence of English. For a wrong length they are mixed and closer to random.
+    :param
+    cipher_text: The text encrypted with VigenereCipher
+    :param
+    max_key_length: The longest key length to score
+    :return:
+    An array where item n is the average index of coincidence over the key positions for length n, and item 0 is NaN
+    """
+    if not isinstance(max_key_length, int) or max_key_length < 1:
+        raise ValueError('Max key length must be a positive int')
+
+    # Vigenere moves through the key on every character, so positions are counted over the whole text
+    positions, letters = _letter_positions(cipher_text, KEY_LENGTH_SAMPLE)
+    scores = np.full(max_key_length + 1, np.nan)
+
+    for key_length in range(1, max_key_length + 1):
+        counts = _column_counts(positions, letters, key_length)
+        totals = counts.sum(axis=1)
+        usable = totals > 1
+        if usable.any():
+            matches = (counts * (counts - 1)).sum(axis=1)[usable]
+            scores[key_length] = (matches / (totals * (totals - 1))[usable]).mean()
+
+    return scores
+
+
+def estimate_vigenere_key_length(cipher_text: str, max_key_length: int = MAX_VIGENERE_KEY_LENGTH) -> int:
+    """
+    Function that guesses the key length of text encrypted with VigenereCipher.
+    Multiples of the real length score just as well as it does, so the shortest length that comes close to the best
+    score is picked.
+    :param
+    cipher_text: The text encrypted with VigenereCipher
+    :param
+    max_key_length: The longest key length to try
+    :return:
+    The most likely key length
+    """
+    scores = vigenere_key_length_scores(cipher_text, max_key_length)
+    if np.isnan(scores).all():
+        raise ValueError('Cipher text has too few letters to score')
+
+    # Long lengths leave few letters per key position, which makes their scores noisy, so allow some slack
+    best = np.nanmax(scores)
+    close = np.flatnonzero(scores >= best - 0.25 * (best - RANDOM_IOC))
+    return int(close[0])
+
+
+def crack_vigenere(cipher_text: str, key_length: int = None, max_key_length: int = MAX_VIGENERE_KEY_LENGTH,
+                   digits: bool = False) -> str:
+    """
+    Function that recovers the key of text encrypted with VigenereCipher.
+    Once the key length is known, the letters at each key position are a Caesar cipher, so every shift of every
+    key position is scored at once by correlating its rolled letter counts with English letter frequencies.
+    :param
+    cipher_text: The text encrypted with VigenereCipher
+    :param
+    key_length: The key length if it is known, or None to guess it
+    :param
+    max_key_length: The longest key length to try when guessing
+    :param
+    digits: Whether the key is made of digits, which VigenereCipher treats as shifts of 0-9
+    :return:
+    The recovered key, in lower case letters or in digits
+    """
+    if not isinstance(cipher_text, str):
+        raise TypeError('Cipher text must be a string')
+    if key_length is None:
+        key_length = estimate_vigenere_key_length(cipher_text, max_key_length)
+    if not isinstance(key_length, int) or key_length < 1:
+        raise ValueError('Key length must be a positive int')
+
+    positions, letters = _letter_positions(cipher_text)
+    counts = _column_counts(positions, letters, key_length)
+
+    # Item [c, k] is how well key position c matches English if its shift is k
+    scores = counts[:, _SHIFTED_LETTERS] @ ENGLISH_FREQUENCIES
+    if digits:
+        scores = scores[:, :10]
+    shifts = scores.argmax(axis=1)
+
+    if digits:
+        return ''.join(str(shift) for shift in shifts)
+    return ''.join(chr(ord('a') + shift) for shift in shifts)
+
+
+def _as_bytes_array(data) -> np.ndarray:
+    """
+    Function that views XOR cipher text as an array of bytes
+    :param
+    data: A bytes-like object from XORCipher.xor_bytes, or the str cipher_text of an ASCII text and key
+    :return:
+    A uint8 array of the bytes
+    """
+    if isinstance(data, str):
+        data = data.encode('latin-1')
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def xor_key_size_scores(data, max_key_size: int = MAX_XOR_KEY_SIZE) -> np.ndarray:
+    """
+    Function that scores every candidate key size for data encrypted with XORCipher.
+    XORing the data with itself moved along by the right key size cancels the key out, leaving two pieces of plain
+    text XORed together, which have fewer differing bits than unrelated bytes. The number of differing bits is found
+    with a popcount lookup table instead of counting bits in Python.
+    :param
+    data: A bytes-like object from XORCipher.xor_bytes, or the str cipher_text of an ASCII text and key
+    :param
+    max_key_size: The longest key size to score
+    :return:
+    An array where item n is the average number of differing bits per byte for size n, and item 0 is NaN
+    """
+    if not isinstance(max_key_size, int) or max_key_size < 1:
+        raise ValueError('Max key size must be a positive int')
+
+    array = _as_bytes_array(data)[:KEY_SIZE_SAMPLE]
+    scores = np.full(max_key_size + 1, np.nan)
+
+    for key_size in range(1, min(max_key_size, len(array) - 1) + 1):
+        scores[key_size] = _POPCOUNT[array[key_size:] ^ array[:-key_size]].mean()
+
+    return scores
+
+
+def estimate_xor_key_size(data, max_key_size: int = MAX_XOR_KEY_SIZE) -> int:
+    """
+    Function that guesses the key size of data encrypted with XORCipher
+    :param
+    data: A bytes-like object from XORCipher.xor_bytes, or the str cipher_text of an ASCII text and key
+    :param
+    max_key_size: The longest key size to try
+    :return:
+    The most likely key size. Multiples of the key size score just as well as the key size itself, so this is the
+    shortest divisor of the best scoring size whose score is nearer the best score than the median one
+    """
+    scores = xor_key_size_scores(data, max_key_size)
+    if np.isnan(scores).all():
+        raise ValueError('Cipher text is too short to score')
+
+    best_size = int(np.nanargmin(scores))
+    threshold = (scores[best_size] + np.nanmedian(scores)) / 2
+    for key_size in range(1, best_size + 1):
+        if best_size % key_size == 0 and scores[key_size] <= threshold:
+            return key_size
+
+
+def crack_xor(data, key_size: int = None, max_key_size: int = MAX_XOR_KEY_SIZE) -> bytes:
+    """
+    Function that recovers the key of data encrypted with XORCipher.
+    The bytes are split into one column per key byte. Each column's byte counts are taken once, and all 256 possible
+    key bytes of every column are scored at once against English byte frequencies with a single matrix product.
+    :param
+    data: A bytes-like object from XORCipher.xor_bytes, or the str cipher_text of an ASCII text and key
+    :param
+    key_size: The key size if it is known, or None to guess it
+    :param
+    max_key_size: The longest key size to try when guessing
+    :return:
+    The recovered key as bytes, which is the UTF-8 encoding of the XORCipher key
+    """
+    if key_size is None:
+        key_size = estimate_xor_key_size(data, max_key_size)
+    if not isinstance(key_size, int) or key_size < 1:
+        raise ValueError('Key size must be a positive int')
+
+    array = _as_bytes_array(data)
+    columns = np.arange(len(array)) % key_size
+    counts = np.bincount(columns * 256 + array, minlength=key_size * 256).reshape(key_size, 256)
+
+    # Item [c, b] is how English column c looks when it is XORed with key byte b
+    scores = counts @ _ENGLISH_BYTE_WEIGHTS[_XORED_BYTES].T
+    return bytes(scores.argmax(axis=1).astype(np.uint8))
+
+
+# Public domain English text that the substitution solver learns character trigrams from when no corpus is given
+DEFAULT_CORPUS = (
+    'When in the Course of human events, it becomes necessary for one people to dissolve the political bands which '
+    'have connected them with another, and to assume among the powers of the earth, the separate and equal station '
+    "to which the Laws of Nature and of Nature's God entitle them, a decent respect to the opinions of mankind "
+    'requires that they should declare the causes which impel them to the separation. We hold these truths to be '
+    'self-evident, that all men are created equal, that they are endowed by their Creator with certain unalienable '
+    'Rights, that among these are Life, Liberty and the pursuit of Happiness. That to secure these rights, '
+    'Governments are instituted among Men, deriving their just powers from the consent of the governed, That '
+    'whenever any Form of Government becomes destructive of these ends, it is the Right of the People to alter or to '
+    'abolish it, and to institute new Government, laying its foundation on such principles and organizing its powers '
+    'in such form, as to them shall seem most likely to effect their Safety and Happiness. Prudence, indeed, will '
+    'dictate that Governments long established should not be changed for light and transient causes; and '
+    'accordingly all experience hath shewn, that mankind are more disposed to suffer, while evils are sufferable, '
+    'than to right themselves by abolishing the forms to which they are accustomed. But when a long train of abuses '
+    'and usurpations, pursuing invariably the same Object evinces a design to reduce them under absolute Despotism, '
+    'it is their right, it is their duty, to throw off such Government, and to provide new Guards for their future '
+    'security.\n'
+    'We the People of the United States, in Order to form a more perfect Union, establish Justice, insure domestic '
+    'Tranquility, provide for the common defence, promote the general Welfare, and secure the Blessings of Liberty '
+    'to ourselves and our Posterity, do ordain and establish this Constitution for the United States of America.\n'
+    'Congress shall make no law respecting an establishment of religion, or prohibiting the free exercise thereof; '
+    'or abridging the freedom of speech, or of the press; or the right of the people peaceably to assemble, and to '
+    'petition the Government for a redress of grievances. A well regulated Militia, being necessary to the security '
+    'of a free State, the right of the people to keep and bear Arms, shall not be infringed. The right of the people '
+    'to be secure in their persons, houses, papers, and effects, against unreasonable searches and seizures, shall '
+    'not be violated, and no Warrants shall issue, but upon probable cause, supported by Oath or affirmation, and '
+    'particularly describing the place to be searched, and the persons or things to be seized.\n'
+    'Call me Ishmael. Some years ago, never mind how long precisely, having little or no money in my purse, and '
+    'nothing particular to interest me on shore, I thought I would sail about a little and see the watery part of '
+    'the world. It is a way I have of driving off the spleen and regulating the circulation. Whenever I find myself '
+    'growing grim about the mouth; whenever it is a damp, drizzly November in my soul; whenever I find myself '
+    'involuntarily pausing before coffin warehouses, and bringing up the rear of every funeral I meet; and '
+    'especially whenever my hypos get such an upper hand of me, that it requires a strong moral principle to prevent '
+    'me from deliberately stepping into the street, and methodically knocking people\'s hats off, then, I account it '
+    'high time to get to sea as soon as I can. This is my substitute for pistol and ball.\n'
+    'It is a truth universally acknowledged, that a single man in possession of a good fortune, must be in want of a '
+    'wife. However little known the feelings or views of such a man may be on his first entering a neighbourhood, '
+    'this truth is so well fixed in the minds of the surrounding families, that he is considered the rightful '
+    'property of some one or other of their daughters. "My dear Mr. Bennet," said his lady to him one day, "have you '
+    'heard that Netherfield Park is let at last?" Mr. Bennet replied that he had not. "But it is," returned she; '
+    '"for Mrs. Long has just been here, and she told me all about it." Mr. Bennet made no answer. "Do you not want '
+    'to know who has taken it?" cried his wife impatiently. "You want to tell me, and I have no objection to hearing '
+    'it." This was invitation enough.\n'
+)
+
+# Characters the substitution solver rearranges, which are the printable ASCII characters used by CustomMappingCipher.
+# Every other character is lumped together as one extra symbol that always stands for itself.
+SUBSTITUTION_ALPHABET = ''.join(chr(code) for code in range(32, 127))
+_OTHER_SYMBOL = len(SUBSTITUTION_ALPHABET)
+_SYMBOL_COUNT = _OTHER_SYMBOL + 1
+
+# Number of swaps tried by each restart of the substitution solver, and the number of restarts
+SUBSTITUTION_ITERATIONS = 20000
+SUBSTITUTION_RESTARTS = 8
+
+
+def _symbols(text: str) -> np.ndarray:
+    """
+    Function that turns text into an array of substitution alphabet positions
+    :param
+    text: The string input to look at
+    :return:
+    An array with the position of each character in SUBSTITUTION_ALPHABET, or _OTHER_SYMBOL if it isn't in it
+    """
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.int64) - 32
+    return np.where((codes >= 0) & (codes < _OTHER_SYMBOL), codes, _OTHER_SYMBOL)
+
+
+def trigram_log_probabilities(corpus: str) -> np.ndarray:
+    """
+    Function that learns how likely every run of three characters is from a sample of text
+    :param
+    corpus: The sample of text, which should be in the same language as the text being solved
+    :return:
+    A flattened array of log-probabilities where item (a * n + b) * n + c is for the symbols a, b, c in a row,
+    n being the number of symbols. Trigrams never seen get a small probability instead of minus infinity.
+    """
+    if not isinstance(corpus, str):
+        raise TypeError('Corpus must be a string')
+
+    symbols = _symbols(corpus)
+    if len(symbols) < 3:
+        raise ValueError('Corpus must be at least three characters long')
+
+    trigrams = (symbols[:-2] * _SYMBOL_COUNT + symbols[1:-1]) * _SYMBOL_COUNT + symbols[2:]
+    counts = np.bincount(trigrams, minlength=_SYMBOL_COUNT ** 3).astype(np.float64)
+    return np.log((counts + 0.01) / (len(trigrams) + 0.01 * len(counts)))
+
+
+def _starting_key(cipher_symbols: np.ndarray, plain_counts: np.ndarray) -> np.ndarray:
+    """
+    Function that makes a first guess at a key by pairing the cipher symbols and the corpus symbols by how common
+    they are
+    :param
+    cipher_symbols: The cipher text as substitution alphabet positions
+    :param
+    plain_counts: How often each symbol appears in the corpus
+    :return:
+    An array where item c is the plain symbol guessed for the cipher symbol c
+    """
+    cipher_counts = np.bincount(cipher_symbols, minlength=_SYMBOL_COUNT)[:_OTHER_SYMBOL]
+    key = np.empty(_SYMBOL_COUNT, dtype=np.int64)
+    key[np.argsort(-cipher_counts, kind='stable')] = np.argsort(-plain_counts[:_OTHER_SYMBOL], kind='stable')
+    key[_OTHER_SYMBOL] = _OTHER_SYMBOL
+    return key
+
+
+# The trigram table and cipher text each worker process keeps for every restart it is given
+_solver_state = None
+
+
+def _init_solver(log_probabilities: np.ndarray, cipher_symbols: np.ndarray, start: np.ndarray) -> None:
+    """
+    Function run once in each worker process to keep hold of what every restart needs, so it is only sent once
+    :param
+    log_probabilities: The table made by trigram_log_probabilities
+    :param
+    cipher_symbols: The cipher text as substitution alphabet positions
+    :param
+    start: The key every restart begins from before it is shuffled
+    """
+    global _solver_state
+    _solver_state = (log_probabilities, cipher_symbols, start)
+
+
+def _anneal(seed, iterations: int, shuffle: bool) -> tuple:
+    """
+    Function run in a worker process for one restart of the substitution solver.
+    The key is changed by swapping what two cipher symbols decrypt to. Only the trigrams that touch a swapped symbol
+    can change, so just those are scored again instead of the whole text. Worse keys are sometimes kept, less often as
+    the temperature falls, so the search can climb out of dead ends.
+    :param
+    seed: The seed for this restart's random numbers
+    :param
+    iterations: The number of swaps to try
+    :param
+    shuffle: Whether to shuffle the starting key first, which every restart but one does
+    :return:
+    A (key, score) pair for the best key found
+    """
+    log_probabilities, cipher_symbols, start = _solver_state
+    random = np.random.default_rng(seed)
+    n = _SYMBOL_COUNT
+    length = len(cipher_symbols)
+
+    # Where each cipher symbol appears, and the trigrams starting at these positions that include one of them
+    present = np.flatnonzero(np.bincount(cipher_symbols, minlength=n)[:_OTHER_SYMBOL])
+    positions = {}
+    touched = {}
+    for symbol in present:
+        positions[symbol] = np.flatnonzero(cipher_symbols == symbol)
+        starts = np.concatenate((positions[symbol] - 2, positions[symbol] - 1, positions[symbol]))
+        touched[symbol] = np.unique(starts[(starts >= 0) & (starts < length - 2)])
+
+    key = start.copy()
+    if shuffle:
+        for first, second in random.integers(0, _OTHER_SYMBOL, size=(len(present), 2)):
+            key[first], key[second] = key[second], key[first]
+
+    plain = key[cipher_symbols]
+    score = log_probabilities[(plain[:-2] * n + plain[1:-1]) * n + plain[2:]].sum()
+    best_key, best_score = key.copy(), score
+
+    firsts = random.choice(present, size=iterations)
+    seconds = random.integers(0, _OTHER_SYMBOL, size=iterations)
+    thresholds = np.log(random.random(iterations))
+    temperatures = np.linspace(length / 500 + 1, 0.01, iterations)
+
+    for first, second, threshold, temperature in zip(firsts, seconds, thresholds, temperatures):
+        if first == second:
+            continue
+
+        if second in touched:
+            starts = np.union1d(touched[first], touched[second])
+        else:
+            starts = touched[first]
+
+        before = log_probabilities[(plain[starts] * n + plain[starts + 1]) * n + plain[starts + 2]].sum()
+        key[first], key[second] = key[second], key[first]
+        plain[positions[first]] = key[first]
+        if second in positions:
+            plain[positions[second]] = key[second]
+        after = log_probabilities[(plain[starts] * n + plain[starts + 1]) * n + plain[starts + 2]].sum()
+
+        change = after - before
+        if change >= 0 or change > threshold * temperature:
+            score += change
+            if score > best_score:
+                best_key, best_score = key.copy(), score
+        else:
+            # Put the swap back
+            key[first], key[second] = key[second], key[first]
+            plain[positions[first]] = key[first]
+            if second in positions:
+                plain[positions[second]] = key[second]
+
+    return best_key, float(best_score)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_log_probabilities() -> np.ndarray:
+    """
+    Function that learns the trigram table from DEFAULT_CORPUS the first time it is needed
+    :return:
+    The table made by trigram_log_probabilities
+    """
+    return trigram_log_probabilities(DEFAULT_CORPUS)
+
+
+def solve_substitution(cipher_text: str, corpus: str = None, restarts: int = SUBSTITUTION_RESTARTS,
+                       iterations: int = SUBSTITUTION_ITERATIONS, workers: int = None, seed: int = None) -> tuple:
+    """
+    Function that recovers the key of text encrypted with a substitution of the printable ASCII characters, like
+    CustomMappingCipher, by simulated annealing on character trigram scores. Several restarts run at once in a pool
+    of worker processes, and the best one wins.
+    :param
+    cipher_text: The text encrypted with the substitution, which needs to be a few hundred characters or more
+    :param
+    corpus: A sample of text in the same language to learn trigrams from, or None to use DEFAULT_CORPUS
+    :param
+    restarts: The number of separate searches to run
+    :param
+    iterations: The number of swaps each search tries
+    :param
+    workers: The number of worker processes, 1 to stay in this process, or None to use one per CPU
+    :param
+    seed: A seed for the random numbers, so the same call gives the same answer, or None for a different one each time
+    :return:
+    A (mapping, score) pair, where mapping is a dictionary from each cipher character to the character it decrypts
+    to, for use with str.maketrans, and score is the trigram log-probability of the decrypted text
+    """
+    if not isinstance(cipher_text, str):
+        raise TypeError('Cipher text must be a string')
+    if not isinstance(restarts, int) or restarts < 1:
+        raise ValueError('Restarts must be a positive int')
+    if not isinstance(iterations, int) or iterations < 1:
+        raise ValueError('Iterations must be a positive int')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError('Workers must be a positive int')
+
+    cipher_symbols = _symbols(cipher_text)
+    if np.count_nonzero(cipher_symbols != _OTHER_SYMBOL) < 3:
+        raise ValueError('Cipher text has too few characters to score')
+
+    if corpus is None:
+        corpus = DEFAULT_CORPUS
+        log_probabilities = _default_log_probabilities()
+    else:
+        log_probabilities = trigram_log_probabilities(corpus)
+    start = _starting_key(cipher_symbols, np.bincount(_symbols(corpus), minlength=_SYMBOL_COUNT))
+
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    arguments = ([iterations] * restarts, [number > 0 for number in range(restarts)])
+    state = (log_probabilities, cipher_symbols, start)
+
+    if workers == 1:
+        _init_solver(*state)
+        results = list(map(_anneal, seeds, *arguments))
+    else:
+        with ProcessPoolExecutor(min(workers, restarts), initializer=_init_solver, initargs=state) as executor:
+            results = list(executor.map(_anneal, seeds, *arguments))
+
+    key, score = max(results, key=lambda result: result[1])
+    mapping = {SUBSTITUTION_ALPHABET[cipher]: SUBSTITUTION_ALPHABET[plain]
+               for cipher, plain in enumerate(key[:_OTHER_SYMBOL])}
+    return mapping, score
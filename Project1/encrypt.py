@@ -8,16 +8,336 @@ Date: 9/23/2024
 Version: Python 3.9
 """
 
+import argparse
+import functools
+import io
+import mmap
+import operator
+import os
+import re
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # The resource module only exists on Unix, so peak memory is not reported elsewhere
+    resource = None
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional, every cipher falls back to plain Python without it
+    np = None
+
+# Default number of characters read per chunk by the streaming methods
+CHUNK_SIZE = 64 * 1024
+
+# Number of bytes XORed at a time by the bytes fast path
+XOR_BLOCK_SIZE = 1024 * 1024
+
+# Default number of bytes of a file mapped at a time when XORing it in place
+XOR_WINDOW_SIZE = 16 * 1024 * 1024
+
+# UTF-8 continuation bytes, which never start a character
+UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+# Splits text into words while keeping the whitespace between them as separate items
+_WORD_SPLIT = re.compile(r'(\s+)')
+
+# Matches a single whitespace character
+_WHITESPACE = re.compile(r'\s')
+
+
+def _read_chunks(reader, chunk_size: int):
+    """
+    Generator that reads a file-like object in chunks until it is exhausted
+    :param
+    reader: Any object with a read(size) method
+    :param
+    chunk_size: The maximum number of characters to read at a time
+    :return:
+    Yields each non-empty chunk that was read
+    """
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError('Chunk size must be a positive int')
+
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _stream_positional(reader, writer, transform, chunk_size: int) -> int:
+    """
+    Runs a transform over every chunk of a reader, passing along how many characters came before it
+    :param
+    reader: The file-like object that is read from
+    :param
+    writer: The file-like object that the transformed chunks are written to
+    :param
+    transform: A function taking (chunk, position) and returning the transformed chunk
+    :param
+    chunk_size: The maximum number of characters to read at a time
+    :return:
+    The total number of characters read
+    """
+    position = 0
+    for chunk in _read_chunks(reader, chunk_size):
+        writer.write(transform(chunk, position))
+        position += len(chunk)
+    return position
+
+
+def _check_range(start: int, stop: int) -> None:
+    """
+    Function that checks the start and stop of a range to decrypt
+    :param
+    start: The position of the first character in the range
+    :param
+    stop: The position just past the last character in the range
+    """
+    if not isinstance(start, int) or not isinstance(stop, int):
+        raise TypeError('Start and stop must be ints')
+    if start < 0 or stop < start:
+        raise ValueError('Start must be at least 0 and stop must not come before start')
+
+
+def _same_file(first_path: str, second_path: str) -> bool:
+    """
+    Function that checks whether two paths lead to the same file, even through links or different spellings
+    :param
+    first_path: The first path
+    :param
+    second_path: The second path
+    :return:
+    True if both paths exist and are the same file
+    """
+    return os.path.exists(first_path) and os.path.exists(second_path) and os.path.samefile(first_path, second_path)
+
+
+def count_utf8_characters(data, start: int = 0, stop: int = None) -> int:
+    """
+    Function that counts the characters in part of some UTF-8 bytes by counting every byte that starts a character.
+    The bytes are counted a block at a time, so a memory-mapped file is never copied all at once.
+    :param
+    data: Any bytes-like object, such as a memory-mapped file
+    :param
+    start: The byte offset to start counting from
+    :param
+    stop: The byte offset to stop counting at, or None for the end of data
+    :return:
+    The number of characters
+    """
+    if stop is None:
+        stop = len(data)
+
+    count = 0
+    for block_start in range(start, stop, XOR_BLOCK_SIZE):
+        block = bytes(data[block_start:min(block_start + XOR_BLOCK_SIZE, stop)])
+        count += len(block.translate(None, UTF8_CONTINUATION_BYTES))
+    return count
+
+
+def _setting(name: str) -> property:
+    """
+    Function that makes a property for a cipher setting such as the key. Changing the setting forgets the decrypted
+    text that str() remembers, so str() always decrypts with the current settings.
+    :param
+    name: The name of the setting, which is stored in the slot with an underscore in front of it
+    :return:
+    The property
+    """
+    slot = '_' + name
+
+    def set_setting(self, value) -> None:
+        setattr(self, slot, value)
+        self._plain_text = None
+
+    return property(operator.attrgetter(slot), set_setting, doc='The ' + name + ' of the cipher')
+
+
+class _Cipher:
+    """
+    Base class for every cipher, which keeps hold of the ciphered text.
+    In lazy mode the ciphered text is only worked out the first time it is used, and the decrypted text returned by
+    str() is remembered so it is only worked out once.
+    """
+    __slots__ = ('_text', '_cipher_text', '_plain_text')
+
+    def _store(self, text: str, lazy: bool) -> None:
+        """
+        Method called by each constructor to encrypt the text now, or to hold on to it until it is needed
+        :param
+        text: The string input that is going to be encrypted
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting
+        """
+        self._plain_text = None
+        if lazy:
+            self._text = text
+            self._cipher_text = None
+        else:
+            self._text = None
+            self._cipher_text = self.encrypt(text)
+
+    @property
+    def cipher_text(self) -> str:
+        """
+        Property for the ciphered text, which is worked out here the first time it is used in lazy mode
+        :return:
+        The ciphered text
+        """
+        if self._cipher_text is None:
+            self._cipher_text = self.encrypt(self._text)
+            self._text = None
+        return self._cipher_text
+
+    @cipher_text.setter
+    def cipher_text(self, cipher_text: str) -> None:
+        """
+        Setter for the ciphered text, which forgets any remembered decrypted text
+        :param
+        cipher_text: The new ciphered text
+        """
+        self._text = None
+        self._cipher_text = cipher_text
+        self._plain_text = None
+
+    def __str__(self) -> str:
+        """
+        Built-in python method to return the decrypted string, which is only decrypted the first time
+        :return:
+        The decrypted text
+        """
+        if self._plain_text is None:
+            self._plain_text = self.decrypt(self.cipher_text)
+        return self._plain_text
+
+
+class SaltedView:
+    """
+    A read-only view of a payload with a salt after it, which references both instead of copying the payload into
+    a new string. It can be written out, compared and indexed like the salted text it stands for.
+    """
+    __slots__ = ('payload', 'salt')
+
+    def __init__(self, payload, salt) -> None:
+        """
+        Constructor method that takes in the payload and the salt
+        :param
+        payload: A string, or a bytes-like object which is held as a memoryview
+        :param
+        salt: The salt, of the same type as payload
+        """
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            payload = memoryview(payload).cast('B')
+        self.payload = payload
+        self.salt = salt
 
-class Salting:
+    def __len__(self) -> int:
+        """
+        Built-in python method to return the length of the salted text
+        :return:
+        The length of the payload plus the length of the salt
+        """
+        return len(self.payload) + len(self.salt)
 
-    def __init__(self, text: str, salt: str) -> None:
+    def __getitem__(self, index):
+        """
+        Built-in python method that reads part of the salted text, copying only that part
+        :param
+        index: An index or a slice, as for a string
+        :return:
+        The character or byte at index, or the sliced text
+        """
+        payload_length = len(self.payload)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.materialize()[index]
+
+            head = self.payload[start:max(start, min(stop, payload_length))]
+            tail = self.salt[max(start - payload_length, 0):max(stop - payload_length, 0)]
+            if isinstance(head, memoryview):
+                head = head.tobytes()
+            return head + tail
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Salted view index out of range')
+        return self.payload[index] if index < payload_length else self.salt[index - payload_length]
+
+    def __eq__(self, other) -> bool:
+        """
+        Built-in python method that compares the view with salted text, or with another view
+        :param
+        other: A string, bytes-like object or SaltedView
+        :return:
+        Whether the salted text is the same
+        """
+        if isinstance(other, SaltedView):
+            other = other.materialize()
+        split = len(self.payload)
+
+        # Both parts are compared where they are, through memoryview slices for bytes
+        if isinstance(self.payload, memoryview) and isinstance(other, (bytes, bytearray, memoryview)):
+            other = memoryview(other).cast('B')
+            return len(other) == len(self) and other[:split] == self.payload and other[split:] == self.salt
+        if isinstance(self.payload, str) and isinstance(other, str):
+            return len(other) == len(self) and other.startswith(self.payload) and other.endswith(self.salt)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """
+        Built-in python method that describes the view without printing the whole payload
+        :return:
+        The description
+        """
+        return 'SaltedView(<{} characters>, {!r})'.format(len(self.payload), self.salt)
+
+    def materialize(self):
+        """
+        Method that builds the salted text as a single string or bytes object, which copies the payload
+        :return:
+        The payload followed by the salt
+        """
+        if isinstance(self.payload, memoryview):
+            return self.payload.tobytes() + self.salt
+        return self.payload + self.salt
+
+    def write_to(self, writer) -> int:
+        """
+        Method that writes the salted text to a file-like object without joining the payload and salt first
+        :param
+        writer: A file-like object opened in text mode for a string payload, or binary mode for bytes
+        :return:
+        The number of characters or bytes written
+        """
+        writer.write(self.payload)
+        writer.write(self.salt)
+        return len(self)
+
+
+class Salting(_Cipher):
+    __slots__ = ('_salt',)
+
+    salt = _setting('salt')
+
+    def __init__(self, text: str, salt: str, lazy: bool = False) -> None:
         """
         Constructor method for taking in the text and salt parameters
         :param
         text: The string input that is going to undergo the Salting cipher
         :param
         salt: The string input that will be added to the end of text
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensure that both text and salt come in as strings, and raises a TypeError if they aren't.
         if not isinstance(text, str):
@@ -26,8 +346,8 @@ class Salting:
             raise TypeError('Salt must be a string')
 
         self.salt = salt
-        # The ciphered text is stored here
-        self.cipher_text = self.salt_cipher(text, salt)
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
 
     def salt_cipher(self, text: str, salt: str) -> str:
         """
@@ -40,42 +360,157 @@ class Salting:
         The salted text that is then stored in self.cipher_text
         """
 
-        self.cipher_text = text + '' + salt
+        self.cipher_text = text + salt
 
         return self.cipher_text
 
-    def unsalted_cipher(self, cipher_text: str) -> str:
+    def salted_view(self, text) -> SaltedView:
+        """
+        Method that salts a piece of text without copying it, for large payloads
+        :param
+        text: A string, or a bytes-like object which is salted with the UTF-8 bytes of the salt
+        :return:
+        A SaltedView of the text followed by the salt
+        """
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            return SaltedView(text, self.salt.encode('utf-8'))
+        if not isinstance(text, str):
+            raise TypeError('Text must be a string or bytes-like object')
+        return SaltedView(text, self.salt)
+
+    def unsalted_cipher(self, cipher_text):
         """
         Method that decrypts the salting cypher
         :param
-        cipher_text: The salted string
+        cipher_text: The salted string, or a SaltedView, whose payload is returned without copying it
         :return:
-        The decrypted version of the string
+        The decrypted version of the string, or for a SaltedView its payload, which is a memoryview when the payload
+        is bytes
         """
-        return cipher_text[: -len(self.salt)]
+        if isinstance(cipher_text, SaltedView):
+            return cipher_text.payload
+        return cipher_text[:len(cipher_text) - len(self.salt)]
 
-    def __str__(self) -> str:
+    def encrypt(self, text: str) -> str:
         """
-        Built-in python method to return a decrypted string
+        Method that salts a piece of text without storing it on the object
+        :param
+        text: The string input that is going to undergo the salting cipher
         :return:
-        The decrypted text
+        The salted text
+        """
+        return text + self.salt
+
+    def decrypt(self, cipher_text):
+        """
+        Method that unsalts a piece of salted text
+        :param
+        cipher_text: The salted string, or a SaltedView
+        :return:
+        The decrypted version of the string, or for a SaltedView its payload, which is a memoryview when the payload
+        is bytes
+        """
+        return self.unsalted_cipher(cipher_text)
+
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that salts everything read from reader, writing it to writer chunk by chunk
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the salted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        count = _stream_positional(reader, writer, lambda chunk, position: chunk, chunk_size)
+        writer.write(self.salt)
+        return count
+
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that unsalts everything read from reader, writing it to writer chunk by chunk
+        :param
+        reader: The file-like object holding the salted text
+        :param
+        writer: The file-like object the unsalted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        salt_length = len(self.salt)
+        pending = ''
+        count = 0
+
+        # Always hold back the last len(salt) characters, since they might be the salt
+        for chunk in _read_chunks(reader, chunk_size):
+            pending += chunk
+            count += len(chunk)
+            if len(pending) > salt_length:
+                cut = len(pending) - salt_length
+                writer.write(pending[:cut])
+                pending = pending[cut:]
+
+        return count
+
+    def salt_file(self, path: str) -> int:
+        """
+        Method that salts a file in place by appending the UTF-8 bytes of the salt to it, which only writes the salt
+        however big the file is
+        :param
+        path: The path of the file
+        :return:
+        The size of the salted file in bytes
+        """
+        with open(path, 'ab') as file:
+            file.write(self.salt.encode('utf-8'))
+            return file.tell()
+
+    def unsalt_file(self, path: str, truncate: bool = True) -> int:
         """
-        return self.unsalted_cipher(self.cipher_text)
+        Method that unsalts a file made by salt_file, seeking straight to the end to check the salt is there
+        :param
+        path: The path of the file
+        :param
+        truncate: Whether to cut the salt off the file, or just leave it there for the caller to ignore
+        :return:
+        The size of the unsalted payload in bytes
+        """
+        salt = self.salt.encode('utf-8')
+
+        with open(path, 'r+b' if truncate else 'rb') as file:
+            size = file.seek(0, os.SEEK_END)
+            if size < len(salt):
+                raise ValueError('File does not end with the salt')
+
+            file.seek(size - len(salt))
+            if file.read() != salt:
+                raise ValueError('File does not end with the salt')
 
+            if truncate:
+                file.truncate(size - len(salt))
+        return size - len(salt)
 
-class ReverseCipher1:
-    def __init__(self, text: str) -> None:
+
+class ReverseCipher1(_Cipher):
+    __slots__ = ()
+
+    def __init__(self, text: str, lazy: bool = False) -> None:
         """
         Constructor method that takes in the text parameter
         :param
         text: The string input that will undergo the 1st reversing cipher
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensures that the text parameter comes in as a string, and raises a TypeError if it doesn't.
         if not isinstance(text, str):
             raise TypeError('Text must be a string')
 
-        # The ciphered text is stored here
-        self.cipher_text = self.reversed_text(text)
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
 
     def reversed_text(self, text: str) -> str:
         """
@@ -85,36 +520,148 @@ class ReverseCipher1:
         :return:
         The encrypted text
         """
-        reversed_string = ''
+        # Slicing with a step of -1 copies the characters in reverse order in a single linear pass
+        return text[::-1]
 
-        # Reverse the text character by character
-        for i in text:
-            reversed_string = i + reversed_string
-
-        return reversed_string
+    def encrypt(self, text: str) -> str:
+        """
+        Method that reverses a piece of text without storing it on the object
+        :param
+        text: The string input that is undergoing the reverse cipher
+        :return:
+        The encrypted text
+        """
+        return self.reversed_text(text)
 
-    def __str__(self) -> str:
+    def decrypt(self, cipher_text: str) -> str:
         """
-        Built-in python method to return a decrypted string
+        Method that undoes the reverse cipher, which is just reversing the text again
+        :param
+        cipher_text: The reversed string
         :return:
         The decrypted text
         """
-        return self.reversed_text(self.cipher_text)
+        return self.reversed_text(cipher_text)
+
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that reverses everything read from reader and writes it to writer.
+        The last chunk has to be written first, so each reversed chunk is spooled to a temporary file
+        and the chunks are then read back in the opposite order.
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the reversed text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        lengths = []
+        count = 0
+
+        with tempfile.TemporaryFile() as spool:
+            for chunk in _read_chunks(reader, chunk_size):
+                data = chunk[::-1].encode('utf-8', 'surrogatepass')
+                spool.write(data)
+                lengths.append(len(data))
+                count += len(chunk)
+
+            # Walk the spooled chunks from the last one back to the first one
+            end = spool.tell()
+            for length in reversed(lengths):
+                end -= length
+                spool.seek(end)
+                writer.write(spool.read(length).decode('utf-8', 'surrogatepass'))
+
+        return count
+
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_stream, which is just reversing the stream again
+        :param
+        reader: The file-like object holding the reversed text
+        :param
+        writer: The file-like object the decrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return self.encrypt_stream(reader, writer, chunk_size)
+
+    def encrypt_file(self, source_path: str, destination_path: str, block_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that reverses a UTF-8 text file into another file without loading it into memory.
+        The source is memory-mapped and read in fixed-size blocks starting from the end, with each block
+        widened to begin on a whole character so multi-byte characters are never split.
+        :param
+        source_path: The path of the file to reverse
+        :param
+        destination_path: The path the reversed file is written to
+        :param
+        block_size: The number of bytes read from the source at a time
+        :return:
+        The number of bytes read
+        """
+        if not isinstance(block_size, int) or block_size <= 0:
+            raise ValueError('Block size must be a positive int')
+        # Opening the destination would empty the source before it was read
+        if _same_file(source_path, destination_path):
+            raise ValueError('Source and destination must be different files')
+
+        with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+            size = os.fstat(source.fileno()).st_size
+            # An empty file cannot be memory-mapped, and there is nothing to reverse anyway
+            if size == 0:
+                return 0
+
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = size
+                while end > 0:
+                    start = max(0, end - block_size)
+                    # Step back over UTF-8 continuation bytes to the start of the character
+                    while start > 0 and data[start] & 0xC0 == 0x80:
+                        start -= 1
+
+                    block = data[start:end].decode('utf-8', 'surrogatepass')
+                    destination.write(block[::-1].encode('utf-8', 'surrogatepass'))
+                    end = start
+
+        return size
+
+    def decrypt_file(self, source_path: str, destination_path: str, block_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_file, which is just reversing the file again
+        :param
+        source_path: The path of the reversed file
+        :param
+        destination_path: The path the decrypted file is written to
+        :param
+        block_size: The number of bytes read from the source at a time
+        :return:
+        The number of bytes read
+        """
+        return self.encrypt_file(source_path, destination_path, block_size)
 
 
-class ReverseCipher2:
-    def __init__(self, text: str) -> None:
+class ReverseCipher2(_Cipher):
+    __slots__ = ()
+
+    def __init__(self, text: str, lazy: bool = False) -> None:
         """
         Constructor method that takes in the text parameter
         :param
         text: The string input that will undergo the 2nd reversing cipher
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensures that the text parameter comes in as a string, and raises a TypeError if it doesn't.
         if not isinstance(text, str):
             raise TypeError('Text must be a string')
 
-        # The ciphered text is stored here
-        self.cipher_text = self.reversed_text_2(text)
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
 
     def reversed_text_2(self, text: str) -> str:
         """
@@ -124,36 +671,102 @@ class ReverseCipher2:
         :return:
         The encrypted text
         """
-        words = text.split()
-        reversed_words = []
+        # Words land on the even positions and the whitespace between them on the odd positions
+        tokens = _WORD_SPLIT.split(text)
 
-        # Reverse each word in the text
-        for word in words:
-            reversed_word = ''
-            # Reverse each character in the word
-            for i in word:
-                reversed_word = i + reversed_word
-            reversed_words.append(reversed_word)
+        # Reverse each word in the text, leaving the whitespace exactly as it was
+        tokens[::2] = [word[::-1] for word in tokens[::2]]
 
-        return ' '.join(reversed_words)
+        return ''.join(tokens)
 
-    def __str__(self) -> str:
+    def encrypt(self, text: str) -> str:
+        """
+        Method that reverses each word of a piece of text without storing it on the object
+        :param
+        text: The string input that is undergoing the reverse cipher
+        :return:
+        The encrypted text
         """
-        Built-in python method to return a decrypted string
+        return self.reversed_text_2(text)
+
+    def decrypt(self, cipher_text: str) -> str:
+        """
+        Method that undoes the word reversing cipher, which is just reversing each word again
+        :param
+        cipher_text: The string with reversed words
         :return:
         The decrypted text
         """
-        return self.reversed_text_2(self.cipher_text)
+        return self.reversed_text_2(cipher_text)
 
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that reverses each word read from reader and writes the result to writer.
+        A word that runs past the end of a chunk is carried over and finished with the next chunk,
+        and all whitespace is written out exactly as it was read.
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the encrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        # Pieces of a word that has not ended yet
+        pending = []
+        count = 0
+
+        for chunk in _read_chunks(reader, chunk_size):
+            count += len(chunk)
+
+            # Find where the last word of the chunk starts by looking for whitespace from the end
+            last_space = _WHITESPACE.search(chunk[::-1])
+            if last_space is None:
+                # The whole chunk is the middle of one word, so keep collecting it
+                pending.append(chunk)
+                continue
+
+            cut = len(chunk) - last_space.start()
+            pending.append(chunk[:cut])
+            writer.write(self.reversed_text_2(''.join(pending)))
 
-class XORCipher:
-    def __init__(self, text: str, key: str) -> None:
+            # Hold back the last word in case it continues in the next chunk
+            pending = [chunk[cut:]]
+
+        writer.write(self.reversed_text_2(''.join(pending)))
+
+        return count
+
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_stream, which is just reversing each word again
+        :param
+        reader: The file-like object holding the encrypted text
+        :param
+        writer: The file-like object the decrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return self.encrypt_stream(reader, writer, chunk_size)
+
+
+class XORCipher(_Cipher):
+    __slots__ = ('_key',)
+
+    key = _setting('key')
+
+    def __init__(self, text: str, key: str, lazy: bool = False) -> None:
         """
         Constructor method that takes in the text and key parameters
         :param
         text: The string input that is undergoing the xor cipher
         :param
         key: The string input to determine how the text will be encrypted
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensures that the text and key parameters come in as a string, and raises a TypeError if they don't.
         if not isinstance(text, str):
@@ -162,16 +775,18 @@ class XORCipher:
             raise TypeError('Key must be a string')
 
         self.key = key
-        # The ciphered text is stored here
-        self.cipher_text = self.xor_words(text, key)
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
 
-    def xor_words(self, text: str, key: str) -> str:
+    def xor_words(self, text: str, key: str, offset: int = 0) -> str:
         """
         Method to cipher the text accordingly
         :param
         text: The string input that is undergoing the xor cipher
         :param
         key: The string input that determines how the text will be encrypted
+        :param
+        offset: The position of the first character of text, which decides where in the key to start
         :return:
         The encrypted text
         """
@@ -179,29 +794,367 @@ class XORCipher:
 
         # Loop over each element in "text" and perform XOR operation with key character
         for i in range(len(text)):
-            xor_char = ord(text[i]) ^ ord(key[i % len(key)])
+            xor_char = ord(text[i]) ^ ord(key[(i + offset) % len(key)])
             xor_char = chr(xor_char)
             xor_list.append(xor_char)
 
         return ''.join(xor_list)
 
-    def __str__(self) -> str:
+    def xor_into(self, buffer, offset: int = 0) -> None:
+        """
+        Method that XORs a writable buffer with the UTF-8 bytes of the key in place.
+        The key is tiled into a block once and whole blocks are XORed at a time, using NumPy when it is
+        installed and Python's big integers otherwise.
+        :param
+        buffer: A bytearray, writable memoryview or other writable buffer
+        :param
+        offset: The position of the first byte of buffer, which decides where in the key to start
+        """
+        view = memoryview(buffer).cast('B')
+        if view.readonly:
+            raise TypeError('Buffer must be writable')
+
+        key = self.key.encode('utf-8')
+        if not key:
+            raise ValueError('Key must not be empty')
+
+        # Build one block of the key, rotated so it starts at the right key position, and no bigger than needed
+        start = offset % len(key)
+        repeats = max(1, -(-min(XOR_BLOCK_SIZE, len(view)) // len(key)))
+        block_size = len(key) * repeats
+        pattern = (key[start:] + key[:start]) * repeats
+
+        if np is not None:
+            array = np.frombuffer(view, dtype=np.uint8)
+            pattern_array = np.frombuffer(pattern, dtype=np.uint8)
+            for i in range(0, len(array), block_size):
+                part = array[i:i + block_size]
+                np.bitwise_xor(part, pattern_array[:len(part)], out=part)
+        else:
+            for i in range(0, len(view), block_size):
+                part = view[i:i + block_size]
+                length = len(part)
+                value = int.from_bytes(part, 'little') ^ int.from_bytes(pattern[:length], 'little')
+                part[:] = value.to_bytes(length, 'little')
+
+    def xor_bytes(self, data, offset: int = 0) -> bytes:
+        """
+        Method that XORs a bytes-like object with the UTF-8 bytes of the key
+        :param
+        data: The bytes, bytearray or memoryview undergoing the xor cipher
+        :param
+        offset: The position of the first byte of data, which decides where in the key to start
+        :return:
+        The XORed bytes
+        """
+        buffer = bytearray(data)
+        self.xor_into(buffer, offset)
+        return bytes(buffer)
+
+    def encrypt(self, text, offset: int = 0):
+        """
+        Method that XORs a piece of text with the key without storing it on the object.
+        Bytes-like input goes through the bytes fast path and comes back as bytes.
+        :param
+        text: The string or bytes-like input that is undergoing the xor cipher
+        :param
+        offset: The position of the first character of text within the whole message
+        :return:
+        The encrypted text
+        """
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            return self.xor_bytes(text, offset)
+        # ASCII XORed with ASCII stays ASCII, so that text can go through the bytes fast path too
+        if text and text.isascii() and self.key.isascii():
+            return self.xor_bytes(text.encode('ascii'), offset).decode('ascii')
+        return self.xor_words(text, self.key, offset)
+
+    def decrypt(self, cipher_text, offset: int = 0):
         """
-        Built-in python method to return a decrypted string
+        Method that undoes the xor cipher, which is just XORing with the key again
+        :param
+        cipher_text: The string or bytes-like input that is going to be decrypted
+        :param
+        offset: The position of the first character of cipher_text within the whole message
         :return:
         The decrypted text
         """
-        return self.xor_words(self.cipher_text, self.key)
+        return self.encrypt(cipher_text, offset)
+
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that XORs everything read from reader and writes it to writer chunk by chunk.
+        The key position carries on from one chunk to the next, and binary streams use the bytes fast path.
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the encrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, self.encrypt, chunk_size)
+
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_stream chunk by chunk
+        :param
+        reader: The file-like object holding the encrypted text
+        :param
+        writer: The file-like object the decrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, self.decrypt, chunk_size)
+
+    def decrypt_range(self, start: int, stop: int) -> str:
+        """
+        Method that decrypts only part of cipher_text, starting from the right place in the key
+        :param
+        start: The position of the first character to decrypt
+        :param
+        stop: The position just past the last character to decrypt
+        :return:
+        The decrypted characters in the range
+        """
+        _check_range(start, stop)
+        return self.decrypt(self.cipher_text[start:stop], start)
+
+    def decrypt_file_range(self, path: str, start: int, stop: int) -> bytes:
+        """
+        Method that decrypts part of a file encrypted with the bytes fast path, without reading the rest of it
+        :param
+        path: The path of the encrypted file, which is memory-mapped
+        :param
+        start: The byte offset of the first byte to decrypt
+        :param
+        stop: The byte offset just past the last byte to decrypt
+        :return:
+        The decrypted bytes in the range
+        """
+        _check_range(start, stop)
 
+        with open(path, 'rb') as file:
+            # An empty file cannot be memory-mapped, and there is nothing to decrypt anyway
+            if os.fstat(file.fileno()).st_size == 0:
+                return b''
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self.xor_bytes(data[start:stop], start)
 
-class CaesarCipher:
-    def __init__(self, text: str, key: int) -> None:
+    def xor_file_inplace(self, path: str, window_size: int = XOR_WINDOW_SIZE, progress=None) -> int:
+        """
+        Method that XORs a whole file with the key in place, so no second copy is needed on disk.
+        XOR undoes itself, so the same call encrypts and decrypts. The file is memory-mapped one window at a time and
+        each window is flushed before the next, so memory use stays at one window however big the file is.
+        :param
+        path: The path of the file, which is overwritten
+        :param
+        window_size: The number of bytes mapped at a time, rounded up to a whole number of memory pages
+        :param
+        progress: A function called after every window with the bytes done so far, the size of the file and the
+        average bytes per second, or None
+        :return:
+        The number of bytes XORed
+        """
+        if not isinstance(window_size, int) or window_size < 1:
+            raise ValueError('Window size must be a positive int')
+        if not self.key:
+            raise ValueError('Key must not be empty')
+
+        # Windows have to start at a multiple of the allocation granularity to be mapped
+        granularity = mmap.ALLOCATIONGRANULARITY
+        window_size = -(-window_size // granularity) * granularity
+        started = time.perf_counter()
+
+        with open(path, 'r+b') as file:
+            size = os.fstat(file.fileno()).st_size
+            for offset in range(0, size, window_size):
+                length = min(window_size, size - offset)
+                with mmap.mmap(file.fileno(), length, offset=offset) as window:
+                    self.xor_into(window, offset)
+                    window.flush()
+
+                if progress is not None:
+                    elapsed = time.perf_counter() - started
+                    done = offset + length
+                    progress(done, size, done / elapsed if elapsed > 0 else 0.0)
+
+        return size
+
+
+def _ascii_shift_table(shift: int) -> bytes:
+    """
+    Function that builds a bytes.translate table that shifts the ASCII letters by a number of places
+    :param
+    shift: The shift in the range 0-25
+    :return:
+    A 256 byte table that leaves every other byte as it is
+    """
+    table = bytearray(range(256))
+    for base in (ord('A'), ord('a')):
+        for position in range(26):
+            table[base + position] = base + (position + shift) % 26
+    return bytes(table)
+
+
+# The bytes.translate table for each of the 26 shifts, used by the ASCII fast paths
+_ASCII_SHIFT_TABLES = tuple(_ascii_shift_table(shift) for shift in range(26))
+
+
+def caesar_bytes(data, shift: int) -> bytes:
+    """
+    Function that applies a Caesar shift to ASCII text held as bytes, in a single bytes.translate call.
+    Bytes outside ASCII are left alone, so this only matches CaesarCipher for ASCII text.
+    :param
+    data: A bytes-like object of ASCII text
+    :param
+    shift: Any integer shift, which is reduced modulo 26
+    :return:
+    The shifted bytes
+    """
+    return bytes(data).translate(_ASCII_SHIFT_TABLES[shift % 26])
+
+
+def vigenere_bytes(data, shifts: tuple, offset: int = 0) -> bytes:
+    """
+    Function that applies Vigenere shifts to ASCII text held as bytes.
+    Every character at the same key position gets the same shift, so each key position is one bytes.translate call
+    over a slice of the data, and the results are woven back together. Bytes outside ASCII are left alone, so this
+    only matches VigenereCipher for ASCII text.
+    :param
+    data: A bytes-like object of ASCII text
+    :param
+    shifts: The shift for each key position, from vigenere_shifts
+    :param
+    offset: The position of the first byte of data, which decides where in the key to start
+    :return:
+    The shifted bytes
+    """
+    if not shifts:
+        raise ValueError('Key must not be empty')
+
+    data = bytes(data)
+    key_length = len(shifts)
+    shifted = bytearray(len(data))
+
+    for i in range(min(key_length, len(data))):
+        table = _ASCII_SHIFT_TABLES[shifts[(i + offset) % key_length]]
+        shifted[i::key_length] = data[i::key_length].translate(table)
+
+    return bytes(shifted)
+
+
+# Characters below this code point are remembered by the Caesar tables even when they are not letters. There are
+# only a few thousand letters in Unicode, so this keeps the tables from growing without end on varied text.
+CAESAR_CACHE_LIMIT = 0x3000
+
+
+class _CaesarTable(dict):
+    """
+    Translation table for one Caesar shift, for use with str.translate.
+    The ASCII letters are filled in up front, and any other character is worked out the first time it is seen,
+    so non-ASCII letters are shifted exactly like the original character loop did. Letters and characters below
+    CAESAR_CACHE_LIMIT are then remembered.
+    """
+
+    def __init__(self, shift: int) -> None:
+        """
+        Constructor method that builds the table for the ASCII letters
+        :param
+        shift: The shift in the range 0-25 that the table applies
+        """
+        super().__init__()
+        self.shift = shift
+        for code in range(ord('A'), ord('Z') + 1):
+            self[code] = (code - ord('A') + shift) % 26 + ord('A')
+        for code in range(ord('a'), ord('z') + 1):
+            self[code] = (code - ord('a') + shift) % 26 + ord('a')
+
+    def __missing__(self, code: int) -> int:
+        """
+        Built-in python method called by str.translate for characters that are not in the table yet
+        :param
+        code: The code point of the character
+        :return:
+        The code point that the character is shifted to
+        """
+        char = chr(code)
+        if char.isupper():
+            result = (code - ord('A') + self.shift) % 26 + ord('A')
+        elif char.islower():
+            result = (code - ord('a') + self.shift) % 26 + ord('a')
+        elif code >= CAESAR_CACHE_LIMIT:
+            return code
+        else:
+            result = code
+
+        self[code] = result
+        return result
+
+
+# The translation table for each of the 26 shifts, created the first time that shift is used
+_caesar_tables = {}
+_caesar_table_stats = {'hits': 0, 'misses': 0}
+
+
+def caesar_table(shift: int, count: bool = True) -> dict:
+    """
+    Function that returns the cached translation table for a Caesar shift, building it if needed
+    :param
+    shift: Any integer shift, which is reduced modulo 26
+    :param
+    count: Whether to count the lookup in caesar_table_stats, which tools that read every table at once turn off
+    so the statistics still show how often messages reuse a table
+    :return:
+    The translation table for str.translate
+    """
+    shift %= 26
+    table = _caesar_tables.get(shift)
+    if table is None:
+        table = _caesar_tables[shift] = _CaesarTable(shift)
+        if count:
+            _caesar_table_stats['misses'] += 1
+    elif count:
+        _caesar_table_stats['hits'] += 1
+    return table
+
+
+def caesar_table_stats() -> dict:
+    """
+    Function that reports how often the Caesar translation tables were reused
+    :return:
+    A dictionary with the number of cache hits, misses and tables currently built
+    """
+    return {'hits': _caesar_table_stats['hits'], 'misses': _caesar_table_stats['misses'],
+            'tables': len(_caesar_tables)}
+
+
+def clear_caesar_tables() -> None:
+    """
+    Function that throws away the cached Caesar translation tables and resets their statistics
+    """
+    _caesar_tables.clear()
+    _caesar_table_stats['hits'] = 0
+    _caesar_table_stats['misses'] = 0
+
+
+class CaesarCipher(_Cipher):
+    __slots__ = ('_key',)
+
+    key = _setting('key')
+
+    def __init__(self, text: str, key: int, lazy: bool = False) -> None:
         """
         Constructor method that takes in the text and key parameters
         :param
         text: The string input that is undergoing the caesar cipher
         :param
         key: The integer input that determines how to text will be encrypted
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensures that the text and key parameters come in as a string, and int, and raises a TypeError if they are not.
         if not isinstance(text, str):
@@ -210,8 +1163,8 @@ class CaesarCipher:
             raise TypeError('Key must be an int')
 
         self.key = key
-        # The ciphered text is stored here
-        self.cipher_text = self.caesar_cipher(text, key)
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
 
     def caesar_cipher(self, text: str, key: int) -> str:
         """
@@ -223,155 +1176,538 @@ class CaesarCipher:
         :return:
         The encrypted text after applying the Caesar cipher
         """
-        ciphered_text = ''
-
-        # Shift each character in the text by the key
-        for i in text:
-            if i.isupper():
-                ciphered_text += chr((ord(i) - ord('A') + key) % 26 + ord('A'))
-            elif i.islower():
-                ciphered_text += chr((ord(i) - ord('a') + key) % 26 + ord('a'))
-            else:
-                ciphered_text += i
+        # Shift every character in one pass using the cached table for this key. The table maps every ASCII letter
+        # to ASCII, so str.translate already handles ASCII text a byte at a time without going through the dict
+        return text.translate(caesar_table(key))
 
-        return ciphered_text
+    def encrypt(self, text: str) -> str:
+        """
+        Method that shifts a piece of text by the key without storing it on the object
+        :param
+        text: The string input that is undergoing the Caesar cipher
+        :return:
+        The encrypted text
+        """
+        return self.caesar_cipher(text, self.key)
 
-    def __str__(self) -> str:
+    def decrypt(self, cipher_text: str) -> str:
         """
-        Built-in python method to return a decrypted string
+        Method that shifts a piece of text back by the key
+        :param
+        cipher_text: The string input that is going to be decrypted
         :return:
-        The decrypted text after applying the reverse of the Caesar cipher
+        The decrypted text
         """
-        return self.caesar_cipher(self.cipher_text, -self.key)
+        return self.caesar_cipher(cipher_text, -self.key)
 
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that applies the Caesar cipher to everything read from reader, writing it to writer chunk by chunk
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the encrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, lambda chunk, position: self.encrypt(chunk), chunk_size)
 
-class VigenereCipher:
-    def __init__(self, text: str, key: str) -> None:
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_stream chunk by chunk
+        :param
+        reader: The file-like object holding the encrypted text
+        :param
+        writer: The file-like object the decrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, lambda chunk, position: self.decrypt(chunk), chunk_size)
+
+
+@functools.lru_cache(maxsize=256)
+def vigenere_shifts(key: str, decrypt: bool = False) -> tuple:
+    """
+    Function that works out the shift for every character of a Vigenere key once
+    :param
+    key: The Vigenere key, where digits shift by their value and other characters by their place in the alphabet
+    :param
+    decrypt: Whether to return the shifts that undo the cipher instead
+    :return:
+    A tuple with one shift in the range 0-25 for every character of the key
+    """
+    shifts = []
+    for key_char in key:
+        if key_char.isdigit():
+            shift = int(key_char)
+        else:
+            shift = ord(key_char.lower()) - ord('a')
+        shifts.append((-shift if decrypt else shift) % 26)
+    return tuple(shifts)
+
+
+def _shift_letter(char: str, shift: int) -> str:
+    """
+    Function that shifts a single character the way the Vigenere and Caesar ciphers do
+    :param
+    char: The character to shift
+    :param
+    shift: The number of places to shift it by
+    :return:
+    The shifted character, or the character itself if it is not a letter
+    """
+    if char.isupper():
+        return chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
+    elif char.islower():
+        return chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
+    return char
+
+
+def _vigenere_python(text: str, shifts: tuple, offset: int) -> str:
+    """
+    Function that applies Vigenere shifts to text one character at a time
+    :param
+    text: The string input that is being shifted
+    :param
+    shifts: The shift for each key position, from vigenere_shifts
+    :param
+    offset: The position of the first character of text
+    :return:
+    The shifted text
+    """
+    key_length = len(shifts)
+    shifted = []
+
+    for i, char in enumerate(text):
+        shifted.append(_shift_letter(char, shifts[(i + offset) % key_length]))
+
+    return ''.join(shifted)
+
+
+def _vigenere_ascii(text: str, shifts: tuple, offset: int) -> str:
+    """
+    Function that applies Vigenere shifts to ASCII text with vigenere_bytes
+    :param
+    text: The ASCII string input that is being shifted
+    :param
+    shifts: The shift for each key position, from vigenere_shifts
+    :param
+    offset: The position of the first character of text
+    :return:
+    The shifted text
+    """
+    return vigenere_bytes(text.encode('ascii'), shifts, offset).decode('ascii')
+
+
+def _vigenere_numpy(text: str, shifts: tuple, offset: int) -> str:
+    """
+    Function that applies Vigenere shifts to the whole text at once with NumPy.
+    ASCII text is handled as a uint8 array and anything else as a uint32 array of code points. Non-ASCII letters
+    are rare, so they are shifted afterwards with the plain Python rule to keep the output identical.
+    :param
+    text: The string input that is being shifted
+    :param
+    shifts: The shift for each key position, from vigenere_shifts
+    :param
+    offset: The position of the first character of text
+    :return:
+    The shifted text
+    """
+    if not text:
+        return ''
+
+    is_ascii = text.isascii()
+    if is_ascii:
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+    # Line the key shifts up with the text, starting at the right key position
+    key_shifts = np.array(shifts, dtype=np.uint8)
+    key_shifts = np.roll(key_shifts, -(offset % len(shifts)))
+    shift_vector = np.tile(key_shifts, len(codes) // len(key_shifts) + 1)[:len(codes)]
+
+    shifted = codes.copy()
+    for base in (ord('A'), ord('a')):
+        # Unsigned subtraction wraps around, so only letters end up below 26
+        position = codes - codes.dtype.type(base)
+        letters = position < 26
+        position += shift_vector
+        position -= (position >= 26) * codes.dtype.type(26)
+        position += base
+        np.copyto(shifted, position, where=letters)
+
+    if is_ascii:
+        return shifted.tobytes().decode('ascii')
+
+    for i in np.flatnonzero(codes > 127):
+        shifted[i] = ord(_shift_letter(chr(codes[i]), int(shift_vector[i])))
+    return shifted.tobytes().decode('utf-32-le', 'surrogatepass')
+
+
+class VigenereCipher(_Cipher):
+    __slots__ = ('_key', '_backend')
+
+    key = _setting('key')
+    backend = _setting('backend')
+
+    # The engines that can be chosen with the backend argument
+    BACKENDS = ('auto', 'python', 'numpy')
+
+    # Shortest text that the auto backend hands to NumPy
+    NUMPY_MIN_LENGTH = 256
+
+    # Longest key that ASCII text is shifted with bytes.translate for, since that takes one call per key position
+    # and NumPy is quicker for long keys
+    TRANSLATE_MAX_KEY_LENGTH = 64
+
+    def __init__(self, text: str, key: str, backend: str = 'auto', lazy: bool = False) -> None:
         """
         Constructor method that takes in the text and key parameters
         :param
         text: The string input that is going to undergo the Vigenere cipher
         :param
         key: The string input used as the keyword to shift the letters
+        :param
+        backend: Which engine to use: 'python', 'numpy', or 'auto' to use NumPy for longer text when it is installed.
+        ASCII text goes through bytes.translate instead unless the backend is 'numpy'
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensures that both text and key are strings, raising a TypeError if they are not.
         if not isinstance(text, str):
             raise TypeError('Text must be a string')
         if not isinstance(key, str):
             raise TypeError('Key must be a string')
+        if backend not in self.BACKENDS:
+            raise ValueError('Backend must be one of ' + ', '.join(self.BACKENDS))
+        if backend == 'numpy' and np is None:
+            raise ValueError('The numpy backend needs NumPy to be installed')
 
         self.key = key
-        # The ciphered text is stored here
-        self.cipher_text = self.vigenere_text(text, key)
+        self.backend = backend
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
 
-    def vigenere_text(self, text: str, key: str) -> str:
+    def _engine(self, text: str, key_length: int):
+        """
+        Method that picks the engine for a piece of text based on the backend
+        :param
+        text: The string input that is about to be shifted
+        :param
+        key_length: The length of the key the text is shifted with
+        :return:
+        The engine function to use
+        """
+        if self.backend == 'numpy':
+            return _vigenere_numpy
+        if text.isascii() and (self.backend == 'python' or np is None or key_length <= self.TRANSLATE_MAX_KEY_LENGTH):
+            return _vigenere_ascii
+        if self.backend == 'auto' and np is not None and len(text) >= self.NUMPY_MIN_LENGTH:
+            return _vigenere_numpy
+        return _vigenere_python
+
+    def vigenere_text(self, text: str, key: str, offset: int = 0) -> str:
         """
         Method to cipher the text using Vigenere cipher technique
         :param
         text: The string input that is undergoing the Vigenere cipher
         :param
         key: The string input used to determine the shifts for the Vigenere cipher
+        :param
+        offset: The position of the first character of text, which decides where in the key to start
         :return:
         The encrypted text after applying the Vigenere cipher
         """
+        if not text:
+            return ''
+        if not key:
+            raise ValueError('Key must not be empty')
+        return self._engine(text, len(key))(text, vigenere_shifts(key), offset)
 
-        ciphered_text = ''
-        key_length = len(key)
-
-        # Shift each character based on the key
-        for i in range(len(text)):
-            char = text[i]
-            key_char = key[i % key_length]
-
-            if key_char.isdigit():
-                shift = int(key_char)
-            else:
-                shift = ord(key_char.lower()) - ord('a')
-
-            if char.isupper():
-                ciphered_text += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
-            elif char.islower():
-                ciphered_text += chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
-            else:
-                ciphered_text += char
-
-        return ciphered_text
-
-    def decrypt_vigenere(self, cipher_text: str, key: str) -> str:
+    def decrypt_vigenere(self, cipher_text: str, key: str, offset: int = 0) -> str:
         """
         Method to decrypt the Vigenere cipher
         :param
         cipher_text: The string input that is going to be decrypted
         :param
         key: The string input used to decrypt the ciphered text
+        :param
+        offset: The position of the first character of cipher_text, which decides where in the key to start
         :return:
         The decrypted text after reversing the Vigenere cipher
         """
-        decrypted_text = ''
-        key_length = len(key)
+        if not cipher_text:
+            return ''
+        if not key:
+            raise ValueError('Key must not be empty')
+        return self._engine(cipher_text, len(key))(cipher_text, vigenere_shifts(key, decrypt=True), offset)
+
+    def encrypt(self, text: str, offset: int = 0) -> str:
+        """
+        Method that applies the Vigenere cipher to a piece of text without storing it on the object
+        :param
+        text: The string input that is undergoing the Vigenere cipher
+        :param
+        offset: The position of the first character of text within the whole message
+        :return:
+        The encrypted text
+        """
+        return self.vigenere_text(text, self.key, offset)
 
-        # Reverse the shift for each character based on the key
-        for i in range(len(cipher_text)):
-            char = cipher_text[i]
-            key_char = key[i % key_length]
+    def decrypt(self, cipher_text: str, offset: int = 0) -> str:
+        """
+        Method that reverses the Vigenere cipher on a piece of text
+        :param
+        cipher_text: The string input that is going to be decrypted
+        :param
+        offset: The position of the first character of cipher_text within the whole message
+        :return:
+        The decrypted text
+        """
+        return self.decrypt_vigenere(cipher_text, self.key, offset)
 
-            if key_char.isdigit():
-                shift = int(key_char)
-            else:
-                shift = ord(key_char.lower()) - ord('a')
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that applies the Vigenere cipher to everything read from reader, writing it to writer chunk by chunk.
+        The key position carries on from one chunk to the next.
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the encrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, self.encrypt, chunk_size)
 
-            if char.isupper():
-                decrypted_text += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-            elif char.islower():
-                decrypted_text += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-            else:
-                decrypted_text += char
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_stream chunk by chunk
+        :param
+        reader: The file-like object holding the encrypted text
+        :param
+        writer: The file-like object the decrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, self.decrypt, chunk_size)
 
-        return decrypted_text
+    def decrypt_range(self, start: int, stop: int) -> str:
+        """
+        Method that decrypts only part of cipher_text, starting from the right place in the key
+        :param
+        start: The position of the first character to decrypt
+        :param
+        stop: The position just past the last character to decrypt
+        :return:
+        The decrypted characters in the range
+        """
+        _check_range(start, stop)
+        return self.decrypt(self.cipher_text[start:stop], start)
 
-    def __str__(self) -> str:
+    def decrypt_file_range(self, path: str, start: int, stop: int, position: int = None) -> str:
         """
-        Built-in python method to return the decrypted string
+        Method that decrypts part of a UTF-8 file encrypted with this cipher, without decrypting the rest of it
+        :param
+        path: The path of the encrypted file, which is memory-mapped
+        :param
+        start: The byte offset of the first byte to decrypt, which must be the start of a character
+        :param
+        stop: The byte offset just past the last byte to decrypt, which must be the end of a character
+        :param
+        position: The character position of start if it is already known, such as start itself for ASCII files.
+        When it is None the characters before start are counted, which is fast but reads that part of the file
         :return:
-        The decrypted text
+        The decrypted text in the range
         """
-        return self.decrypt_vigenere(self.cipher_text, self.key)
+        _check_range(start, stop)
+
+        with open(path, 'rb') as file:
+            # An empty file cannot be memory-mapped, and there is nothing to decrypt anyway
+            if os.fstat(file.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if start < len(data) and data[start] & 0xC0 == 0x80:
+                    raise ValueError('Start must be the first byte of a character')
+                if position is None:
+                    position = count_utf8_characters(data, 0, start)
+                chunk = data[start:stop]
+
+        return self.decrypt(chunk.decode('utf-8', 'surrogatepass'), position)
 
 
-class CustomMappingCipher:
-    def __init__(self, text: str) -> None:
+class _MappingTable(dict):
+    """
+    Translation table for str.translate that decides what happens to characters without a mapping
+    """
+
+    def __init__(self, table: dict, policy: str, replacement: str) -> None:
+        """
+        Constructor method that copies a str.maketrans table
+        :param
+        table: The table made by str.maketrans
+        :param
+        policy: Either 'replace' to swap unmapped characters for replacement, or 'strict' to raise a ValueError
+        :param
+        replacement: The character used by the 'replace' policy
+        """
+        super().__init__(table)
+        self.policy = policy
+        self.replacement = ord(replacement)
+
+    def __missing__(self, code: int) -> int:
+        """
+        Built-in python method called by str.translate for characters that are not in the table
+        :param
+        code: The code point of the unmapped character
+        :return:
+        The code point of the replacement character
+        """
+        if self.policy == 'strict':
+            raise ValueError('Character ' + repr(chr(code)) + ' has no mapping')
+
+        self[code] = self.replacement
+        return self.replacement
+
+
+class CustomMappingCipher(_Cipher):
+    __slots__ = ('_unmapped', '_replacement')
+
+    unmapped = _setting('unmapped')
+    replacement = _setting('replacement')
+
+    # Custom character map for encryption, shared by every instance
+    character_map = {
+        'a': ',', 'b': 'c', 'c': '/', 'd': '&', 'e': 'k', 'f': '}', 'g': '4', 'h': 'w',
+        'i': '>', 'j': 'b', 'k': 'W', 'l': 'P', 'm': 'V', 'n': '$', 'o': '"', 'p': '`',
+        'q': 'U', 'r': 'x', 's': '~', 't': 'o', 'u': 'K', 'v': 'B', 'w': ']', 'x': 'e',
+        'y': '[', 'z': '7', 'A': 'H', 'B': 'i', 'C': 'G', 'D': 's', 'E': ';', 'F': 'A',
+        'G': 'y', 'H': 'g', 'I': 'r', 'J': '%', 'K': 'p', 'L': '^', 'M': 'C', 'N': '6',
+        'O': 'O', 'P': '8', 'Q': '3', 'R': '\\', 'S': '5', 'T': '0', 'U': 'Y', 'V': '1',
+        'W': '+', 'X': '{', 'Y': '2', 'Z': 'D', '0': '(', '1': '=', '2': '?', '3': 'q',
+        '4': '<', '5': 't', '6': 'f', '7': 'L', '8': '|', '9': 'l', '!': 'Q', '"': 'F',
+        '#': 'h', '$': ')', '%': 'X', '&': 'd', "'": 'j', '(': '.', ')': 'v', '*': 'E',
+        '+': "'", ',': '#', '-': '@', '.': '*', '/': 'z', ':': 'S', ';': ':', '<': 'N',
+        '=': 'Z', '>': ' ', '?': 'T', '@': '-', '[': 'R', '\\': 'u', ']': 'M', '^': '9',
+        '_': '_', '`': 'a', '{': 'n', '|': 'I', '}': 'J', '~': '!', ' ': 'm'
+    }
+
+    # Reverse character map for decryption
+    reverse_character_map = dict(zip(character_map.values(), character_map.keys()))
+
+    # What can happen to a character that is not in the map
+    UNMAPPED_POLICIES = ('pass', 'replace', 'strict')
+
+    # The compiled translation tables, built once and shared by every instance
+    _tables = {
+        ('encrypt', 'pass', None): str.maketrans(character_map),
+        ('decrypt', 'pass', None): str.maketrans(reverse_character_map),
+    }
+
+    # The bytes.translate tables for ASCII text, built from _tables when they are first needed
+    _ascii_tables = {}
+
+    # Every ASCII character that has a mapping, for checking text against the 'strict' policy
+    _mapped_bytes = {
+        'encrypt': ''.join(character_map).encode('ascii'),
+        'decrypt': ''.join(reverse_character_map).encode('ascii'),
+    }
+
+    def __init__(self, text: str, unmapped: str = 'pass', replacement: str = '?', lazy: bool = False) -> None:
         """
         Constructor method that takes in the text parameter
         :param
         text: The string input that is going to undergo the Custom Mapping cipher
+        :param
+        unmapped: What to do with characters that are not in the map: 'pass' leaves them as they are,
+        'replace' swaps them for replacement, and 'strict' raises a ValueError
+        :param
+        replacement: The single character used by the 'replace' policy
+        :param
+        lazy: Whether to wait until cipher_text is first used before encrypting the text
         """
         # Ensures that the text parameter is a string, and raises a TypeError if it is not.
         if not isinstance(text, str):
             raise TypeError('Text must be a string')
+        if unmapped not in self.UNMAPPED_POLICIES:
+            raise ValueError('Unmapped policy must be one of ' + ', '.join(self.UNMAPPED_POLICIES))
+        if not isinstance(replacement, str) or len(replacement) != 1:
+            raise TypeError('Replacement must be a single character string')
+
+        self.unmapped = unmapped
+        self.replacement = replacement
+
+        # The ciphered text is stored here, or worked out the first time it is used in lazy mode
+        self._store(text, lazy)
+
+    def _table(self, direction: str) -> dict:
+        """
+        Method that looks up the shared translation table for a direction and this object's unmapped policy
+        :param
+        direction: Either 'encrypt' or 'decrypt'
+        :return:
+        The translation table for str.translate
+        """
+        replacement = None if self.unmapped == 'pass' else self.replacement
+        table_key = (direction, self.unmapped, replacement)
+        table = self._tables.get(table_key)
+
+        if table is None:
+            table = _MappingTable(self._tables[(direction, 'pass', None)], self.unmapped, self.replacement)
+            CustomMappingCipher._tables[table_key] = table
 
-        # Custom character map for encryption
-        self.character_map = {
-            'a': ',', 'b': 'c', 'c': '/', 'd': '&', 'e': 'k', 'f': '}', 'g': '4', 'h': 'w',
-            'i': '>', 'j': 'b', 'k': 'W', 'l': 'P', 'm': 'V', 'n': '$', 'o': '"', 'p': '`',
-            'q': 'U', 'r': 'x', 's': '~', 't': 'o', 'u': 'K', 'v': 'B', 'w': ']', 'x': 'e',
-            'y': '[', 'z': '7', 'A': 'H', 'B': 'i', 'C': 'G', 'D': 's', 'E': ';', 'F': 'A',
-            'G': 'y', 'H': 'g', 'I': 'r', 'J': '%', 'K': 'p', 'L': '^', 'M': 'C', 'N': '6',
-            'O': 'O', 'P': '8', 'Q': '3', 'R': '\\', 'S': '5', 'T': '0', 'U': 'Y', 'V': '1',
-            'W': '+', 'X': '{', 'Y': '2', 'Z': 'D', '0': '(', '1': '=', '2': '?', '3': 'q',
-            '4': '<', '5': 't', '6': 'f', '7': 'L', '8': '|', '9': 'l', '!': 'Q', '"': 'F',
-            '#': 'h', '$': ')', '%': 'X', '&': 'd', "'": 'j', '(': '.', ')': 'v', '*': 'E',
-            '+': "'", ',': '#', '-': '@', '.': '*', '/': 'z', ':': 'S', ';': ':', '<': 'N',
-            '=': 'Z', '>': ' ', '?': 'T', '@': '-', '[': 'R', '\\': 'u', ']': 'M', '^': '9',
-            '_': '_', '`': 'a', '{': 'n', '|': 'I', '}': 'J', '~': '!', ' ': 'm'
-        }
-
-        # Reverse character map for decryption
-        self.reverse_character_map = {}
-        for key, value in self.character_map.items():
-            self.reverse_character_map[value] = key
-
-        # The ciphered text is stored here
-        self.cipher_text = self.map_encryption(text)
+        return table
+
+    def _ascii_table(self, direction: str) -> bytes:
+        """
+        Method that looks up the shared bytes.translate table for ASCII text for a direction and this object's
+        unmapped policy
+        :param
+        direction: Either 'encrypt' or 'decrypt'
+        :return:
+        The 256 byte table, or None if the policy can turn ASCII into something else
+        """
+        replacement = None if self.unmapped == 'pass' else self.replacement
+        table_key = (direction, self.unmapped, replacement)
+
+        if table_key not in self._ascii_tables:
+            base = self._tables[(direction, 'pass', None)]
+            table = None
+            if self.unmapped != 'replace' or self.replacement.isascii():
+                # Unmapped characters stay as they are here, since strict text is checked before it is translated
+                unmapped = [ord(self.replacement) if self.unmapped == 'replace' else code for code in range(128)]
+                table = bytes(ord(base[code]) if code in base else unmapped[code] for code in range(128))
+                table += bytes(range(128, 256))
+            CustomMappingCipher._ascii_tables[table_key] = table
+
+        return self._ascii_tables[table_key]
+
+    def map_bytes(self, data, direction: str = 'encrypt') -> bytes:
+        """
+        Method that applies the custom mapping to ASCII text held as bytes, in a single bytes.translate call
+        :param
+        data: A bytes-like object of ASCII text
+        :param
+        direction: Either 'encrypt' or 'decrypt'
+        :return:
+        The mapped bytes
+        """
+        table = self._ascii_table(direction)
+        data = bytes(data)
+        if table is None or not data.isascii():
+            raise ValueError('map_bytes only works on ASCII text with an ASCII replacement')
+        if self.unmapped == 'strict' and data.translate(None, self._mapped_bytes[direction]):
+            # Let str.translate find the unmapped character and raise the usual error
+            data.decode('ascii').translate(self._table(direction))
+        return data.translate(table)
 
     def map_encryption(self, text) -> str:
         """
@@ -381,12 +1717,7 @@ class CustomMappingCipher:
         :return:
         The encrypted text after applying the custom mapping cipher
         """
-        encrypted_text = ''
-
-        # Apply the custom character mapping
-        for i in text:
-            encrypted_text += self.character_map.get(i)
-        return encrypted_text
+        return text.translate(self._table('encrypt'))
 
     def map_decryption(self, cipher_text: str) -> str:
         """
@@ -396,37 +1727,257 @@ class CustomMappingCipher:
         :return:
         The decrypted text after reversing the custom mapping cipher
         """
-        decrypted_text = ''
+        return cipher_text.translate(self._table('decrypt'))
 
-        # Reverse the custom character mapping
-        for i in cipher_text:
-            decrypted_text += self.reverse_character_map.get(i)
-        return decrypted_text
+    def encrypt(self, text: str) -> str:
+        """
+        Method that applies the custom mapping to a piece of text without storing it on the object
+        :param
+        text: The string input that is undergoing the custom mapping cipher
+        :return:
+        The encrypted text
+        """
+        return self.map_encryption(text)
 
-    def __str__(self) -> str:
+    def decrypt(self, cipher_text: str) -> str:
         """
-        Built-in python method to return the decrypted string
+        Method that reverses the custom mapping on a piece of text
+        :param
+        cipher_text: The string input that is going to be decrypted
         :return:
         The decrypted text
         """
-        return self.map_decryption(self.cipher_text)
+        return self.map_decryption(cipher_text)
+
+    def encrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that applies the custom mapping to everything read from reader, writing it to writer chunk by chunk
+        :param
+        reader: The file-like object holding the text
+        :param
+        writer: The file-like object the encrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, lambda chunk, position: self.encrypt(chunk), chunk_size)
+
+    def decrypt_stream(self, reader, writer, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Method that undoes encrypt_stream chunk by chunk
+        :param
+        reader: The file-like object holding the encrypted text
+        :param
+        writer: The file-like object the decrypted text is written to
+        :param
+        chunk_size: The maximum number of characters held in memory at once
+        :return:
+        The number of characters read
+        """
+        return _stream_positional(reader, writer, lambda chunk, position: self.decrypt(chunk), chunk_size)
+
+
+# Every cipher by the short name used for it in cipher specs
+CIPHERS = {
+    'salting': Salting,
+    'reverse1': ReverseCipher1,
+    'reverse2': ReverseCipher2,
+    'xor': XORCipher,
+    'caesar': CaesarCipher,
+    'vigenere': VigenereCipher,
+    'mapping': CustomMappingCipher,
+}
+
+
+def make_cipher(cipher_spec):
+    """
+    Function that builds a cipher object, with empty text, from a cipher spec
+    :param
+    cipher_spec: A cipher name from CIPHERS, a tuple of a name followed by the cipher's other arguments
+    such as ('caesar', 3), or an existing cipher object, which is returned as it is
+    :return:
+    The cipher object, ready to have its encrypt and decrypt methods called
+    """
+    if isinstance(cipher_spec, tuple(CIPHERS.values())):
+        return cipher_spec
+
+    if isinstance(cipher_spec, str):
+        cipher_spec = (cipher_spec,)
+    if not isinstance(cipher_spec, tuple) or not cipher_spec:
+        raise TypeError('Cipher spec must be a cipher name, a tuple starting with a cipher name, or a cipher')
+
+    name = cipher_spec[0]
+    if name not in CIPHERS:
+        raise ValueError('Cipher name must be one of ' + ', '.join(CIPHERS))
+    return CIPHERS[name]('', *cipher_spec[1:])
+
+
+# Ciphers the command line tool needs a key for, and ciphers whose key is an int
+_KEYED_CIPHERS = ('salting', 'xor', 'caesar', 'vigenere')
+_INT_KEY_CIPHERS = ('caesar',)
+
+
+def _peak_rss() -> float:
+    """
+    Function that finds the most memory this process, or any of its finished worker processes, has used at once
+    :return:
+    The peak resident set size in megabytes, or None where the resource module is not available
+    """
+    if resource is None:
+        return None
+
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes and macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _open_input(path: str, binary: bool):
+    """
+    Function that opens the input of the command line tool
+    :param
+    path: The path to read, or '-' for standard input
+    :param
+    binary: Whether to read bytes instead of UTF-8 text
+    :return:
+    The file-like object
+    """
+    if path == '-':
+        stream = sys.stdin.buffer
+        return stream if binary else io.TextIOWrapper(stream, encoding='utf-8', errors='surrogatepass', newline='')
+    if binary:
+        return open(path, 'rb')
+    return open(path, 'r', encoding='utf-8', errors='surrogatepass', newline='')
+
+
+def _open_output(path: str, binary: bool):
+    """
+    Function that opens the output of the command line tool
+    :param
+    path: The path to write, or '-' for standard output
+    :param
+    binary: Whether to write bytes instead of UTF-8 text
+    :return:
+    The file-like object
+    """
+    if path == '-':
+        stream = sys.stdout.buffer
+        return stream if binary else io.TextIOWrapper(stream, encoding='utf-8', errors='surrogatepass', newline='',
+                                                      write_through=True)
+    if binary:
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8', errors='surrogatepass', newline='')
+
+
+def _run(arguments, cipher_spec: tuple) -> int:
+    """
+    Function that encrypts or decrypts the input for the command line tool, picking the quickest path it can use
+    :param
+    arguments: The parsed command line arguments
+    :param
+    cipher_spec: The cipher spec built from the arguments
+    :return:
+    The number of bytes or characters processed
+    """
+    files = arguments.input != '-' and arguments.output != '-'
+
+    if arguments.workers > 1:
+        # Imported here because parallel imports this module
+        from parallel import encrypt_file_parallel, decrypt_file_parallel
+        run = decrypt_file_parallel if arguments.decrypt else encrypt_file_parallel
+        options = {} if arguments.chunk_size is None else {'chunk_size': arguments.chunk_size}
+        # The spec is passed on rather than a cipher object, since this module may be running as __main__, whose
+        # classes are not the ones parallel checks against
+        return run(arguments.input, arguments.output, cipher_spec, arguments.workers, **options)
+
+    cipher = make_cipher(cipher_spec)
+    chunk_size = CHUNK_SIZE if arguments.chunk_size is None else arguments.chunk_size
+    if isinstance(cipher, ReverseCipher1) and files:
+        # Reversing reads the memory-mapped file backwards instead of spooling it to a temporary file
+        run = cipher.decrypt_file if arguments.decrypt else cipher.encrypt_file
+        return run(arguments.input, arguments.output, chunk_size)
+
+    binary = isinstance(cipher, XORCipher)
+    reader = _open_input(arguments.input, binary)
+    writer = _open_output(arguments.output, binary)
+    try:
+        run = cipher.decrypt_stream if arguments.decrypt else cipher.encrypt_stream
+        return run(reader, writer, chunk_size)
+    finally:
+        writer.flush()
+        for path, stream in ((arguments.input, reader), (arguments.output, writer)):
+            if path != '-':
+                stream.close()
+            elif isinstance(stream, io.TextIOWrapper):
+                # Detach the wrapper so standard input and output are left open
+                stream.detach()
+
+
+def main(argv: list = None) -> int:
+    """
+    Function that runs the command line tool, which encrypts or decrypts a file, or standard input, with one of the
+    ciphers and reports how long it took to standard error.
+    Run it with, for example: python -m encrypt vigenere --key gvsu notes.txt -o notes.enc
+    :param
+    argv: The command line arguments, or None to use sys.argv
+    :return:
+    The exit status, which is 0 on success
+    """
+    parser = argparse.ArgumentParser(prog='python -m encrypt', description='Encrypt or decrypt a file with a cipher.')
+    parser.add_argument('cipher', choices=list(CIPHERS), help='the cipher to use')
+    parser.add_argument('input', nargs='?', default='-', help='the file to read, or - for standard input (default)')
+    parser.add_argument('-o', '--output', default='-', help='the file to write, or - for standard output (default)')
+    parser.add_argument('-k', '--key', help='the key, or the salt for salting')
+    parser.add_argument('-d', '--decrypt', action='store_true', help='decrypt instead of encrypting')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of worker processes, which needs input and output files (default 1)')
+    parser.add_argument('--chunk-size', type=int,
+                        help='characters read at a time, or bytes per worker chunk when there are several workers')
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't report the throughput")
+    arguments = parser.parse_intermixed_args(argv)
+
+    if arguments.cipher in _KEYED_CIPHERS and arguments.key is None:
+        parser.error(arguments.cipher + ' needs a --key')
+    if arguments.cipher not in _KEYED_CIPHERS and arguments.key is not None:
+        parser.error(arguments.cipher + ' does not take a key')
+    if arguments.workers < 1:
+        parser.error('--workers must be at least 1')
+    if arguments.chunk_size is not None and arguments.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if arguments.workers > 1 and '-' in (arguments.input, arguments.output):
+        parser.error('--workers needs input and output files')
+    # The output is opened for writing before the input is read, which would empty the file
+    if '-' not in (arguments.input, arguments.output) and _same_file(arguments.input, arguments.output):
+        parser.error('input and output must be different files')
+
+    key = arguments.key
+    if arguments.cipher in _INT_KEY_CIPHERS:
+        try:
+            key = int(key)
+        except ValueError:
+            parser.error(arguments.cipher + ' needs a whole number --key')
+    cipher_spec = (arguments.cipher,) if key is None else (arguments.cipher, key)
+
+    started = time.perf_counter()
+    try:
+        count = _run(arguments, cipher_spec)
+    except (OSError, ValueError) as error:
+        print('error:', error, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if not arguments.quiet:
+        if arguments.input != '-':
+            count = os.path.getsize(arguments.input)
+        megabytes = count / (1024 * 1024)
+        peak = _peak_rss()
+        print('{} {:.2f} MB in {:.3f} s ({:.1f} MB/s), peak RSS {}'.format(
+            'decrypted' if arguments.decrypt else 'encrypted', megabytes, elapsed,
+            megabytes / elapsed if elapsed > 0 else 0.0, 'n/a' if peak is None else '{:.1f} MB'.format(peak)),
+            file=sys.stderr)
+    return 0
 
 
 if __name__ == '__main__':
-    text = 'Hello, Students'
-    salt = 'gvsulakers'
-    key = 'gvsu'
-    my_salt = Salting(text, salt)
-    rev1 = ReverseCipher1(text)
-    rev2 = ReverseCipher2(text)
-    xor1 = XORCipher(text, key)
-    caesar = CaesarCipher(text, key)
-    vigenere = VigenereCipher(text, key)
-    my_map = CustomMappingCipher(text)
-    print(my_salt)
-    print(rev1)
-    print(rev2)
-    print(xor1)
-    print(caesar)
-    print(vigenere)
-    print(my_map)
+    sys.exit(main())
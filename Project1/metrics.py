@@ -0,0 +1,279 @@
+"""
+This is an opt-in metrics layer for the ciphers in encrypt.py. Once enabled, it counts the calls, characters and time
+spent in every cipher's encrypt and decrypt methods, so it is easy to see which cipher is using the most CPU.
+
+Nothing is measured until enable() is called. It swaps each cipher's methods for timed versions, and disable() puts
+the originals back, so there is no overhead while metrics are off. Methods looked up while metrics were on, such as
+the stages of a CipherPipeline, only check a flag and call straight through once metrics are off again.
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+from encrypt import CIPHERS
+
+# The cipher methods that are measured
+OPERATIONS = ('encrypt', 'decrypt')
+
+# Number of recent call times kept for each method to work out the percentiles from
+LATENCY_SAMPLES = 1024
+
+# The original method for each (cipher class, operation) while metrics are enabled, and whether they are enabled
+_originals = {}
+_enabled = False
+
+# The measurements for each (cipher name, operation), and the lock that guards them
+_stats = {}
+_lock = threading.Lock()
+
+# Whether the current thread is already inside a measured method, so calls between ciphers' own methods, such as
+# XORCipher.decrypt calling encrypt, are only counted once
+_active = threading.local()
+
+# The timer for the periodic JSON dump, while one is running
+_dump_timer = None
+
+
+class _MethodStats:
+    """
+    The measurements for one method of one cipher
+    """
+    __slots__ = ('calls', 'characters', 'seconds', 'latencies')
+
+    def __init__(self) -> None:
+        """
+        Constructor method that starts every count at zero
+        """
+        self.calls = 0
+        self.characters = 0
+        self.seconds = 0.0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, characters: int, seconds: float) -> None:
+        """
+        Method that adds one call to the measurements
+        :param
+        characters: The length of the text passed to the method
+        :param
+        seconds: How long the call took
+        """
+        self.calls += 1
+        self.characters += characters
+        self.seconds += seconds
+        self.latencies.append(seconds)
+
+    def as_dict(self) -> dict:
+        """
+        Method that turns the measurements into a dictionary
+        :return:
+        The number of calls and characters, the total seconds, and the 50th, 90th and 99th percentile call times
+        in milliseconds over the most recent calls
+        """
+        ordered = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+        return {
+            'calls': self.calls,
+            'characters': self.characters,
+            'seconds': self.seconds,
+            'p50_ms': percentile(0.5),
+            'p90_ms': percentile(0.9),
+            'p99_ms': percentile(0.99),
+        }
+
+
+def _measured(method, cipher_name: str, operation: str):
+    """
+    Function that wraps a cipher method so every call to it is measured
+    :param
+    method: The original method
+    :param
+    cipher_name: The name of the cipher class
+    :param
+    operation: Either 'encrypt' or 'decrypt'
+    :return:
+    The wrapped method
+    """
+    key = (cipher_name, operation)
+
+    @functools.wraps(method)
+    def wrapper(self, text, *args, **kwargs):
+        if not _enabled or getattr(_active, 'depth', 0):
+            return method(self, text, *args, **kwargs)
+
+        _active.depth = 1
+        started = time.perf_counter()
+        try:
+            return method(self, text, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started
+            _active.depth = 0
+            with _lock:
+                stats = _stats.get(key)
+                if stats is None:
+                    stats = _stats[key] = _MethodStats()
+                stats.record(len(text), seconds)
+
+    return wrapper
+
+
+def enable() -> None:
+    """
+    Function that starts measuring every cipher's encrypt and decrypt methods. Calling it again does nothing.
+    """
+    global _enabled
+    with _lock:
+        if _originals:
+            return
+        _enabled = True
+        for cipher_class in CIPHERS.values():
+            for operation in OPERATIONS:
+                method = cipher_class.__dict__[operation]
+                _originals[(cipher_class, operation)] = method
+                setattr(cipher_class, operation, _measured(method, cipher_class.__name__, operation))
+
+
+def disable() -> None:
+    """
+    Function that stops measuring and puts the original methods back, keeping the measurements made so far
+    """
+    global _enabled
+    with _lock:
+        _enabled = False
+        for (cipher_class, operation), method in _originals.items():
+            setattr(cipher_class, operation, method)
+        _originals.clear()
+
+
+def is_enabled() -> bool:
+    """
+    Function that checks whether metrics are being recorded
+    :return:
+    True if enable() has been called without a matching disable()
+    """
+    return _enabled
+
+
+def reset() -> None:
+    """
+    Function that throws away every measurement
+    """
+    with _lock:
+        _stats.clear()
+
+
+def snapshot() -> dict:
+    """
+    Function that copies the current measurements
+    :return:
+    A dictionary from cipher class names to dictionaries from 'encrypt' and 'decrypt' to their measurements,
+    for the methods that have been called
+    """
+    with _lock:
+        items = [(key, stats.as_dict()) for key, stats in _stats.items()]
+
+    result = {}
+    for (cipher_name, operation), measurements in sorted(items):
+        result.setdefault(cipher_name, {})[operation] = measurements
+    return result
+
+
+def dump(path: str) -> None:
+    """
+    Function that writes a snapshot to a JSON file. The file is replaced in one step, so a reader never sees it
+    half written.
+    :param
+    path: The path of the JSON file
+    """
+    data = {'time': time.time(), 'enabled': is_enabled(), 'ciphers': snapshot()}
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+class _DumpTimer:
+    """
+    A background timer that writes a snapshot to a JSON file every interval seconds until it is cancelled
+    """
+
+    def __init__(self, path: str, interval: float) -> None:
+        """
+        Constructor method that takes in where and how often to dump
+        :param
+        path: The path of the JSON file
+        :param
+        interval: The number of seconds between dumps
+        """
+        self.path = path
+        self.interval = interval
+        self.cancelled = False
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Method that schedules the next dump, unless the timer has been cancelled
+        """
+        with self._lock:
+            if not self.cancelled:
+                self._timer = threading.Timer(self.interval, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _run(self) -> None:
+        """
+        Method run on the timer thread to write a dump and schedule the next one
+        """
+        dump(self.path)
+        self.start()
+
+    def cancel(self) -> None:
+        """
+        Method that stops any more dumps from being written
+        """
+        with self._lock:
+            self.cancelled = True
+            if self._timer is not None:
+                self._timer.cancel()
+
+
+def start_dump(path: str, interval: float = 60.0) -> None:
+    """
+    Function that writes a snapshot to a JSON file every interval seconds on a background thread, replacing any
+    dump that is already running
+    :param
+    path: The path of the JSON file
+    :param
+    interval: The number of seconds between dumps
+    """
+    global _dump_timer
+    if not isinstance(interval, (int, float)) or interval <= 0:
+        raise ValueError('Interval must be a positive number')
+
+    stop_dump()
+    _dump_timer = _DumpTimer(path, interval)
+    _dump_timer.start()
+
+
+def stop_dump() -> None:
+    """
+    Function that stops the periodic JSON dump, if one is running
+    """
+    global _dump_timer
+    if _dump_timer is not None:
+        _dump_timer.cancel()
+        _dump_timer = None
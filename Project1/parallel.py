@@ -0,0 +1,410 @@
+"""
+This is a set of helpers for encrypting many records, or large files, across several processes with the ciphers
+from encrypt.py.
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import collections
+import itertools
+import mmap
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from encrypt import XORCipher, CaesarCipher, VigenereCipher, CustomMappingCipher, count_utf8_characters, make_cipher
+
+# Number of records sent to a worker at a time
+BATCH_SIZE = 1024
+
+# Number of bytes of a file handed to a worker at a time
+FILE_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Ciphers that can encrypt a file in separate chunks, and whether they work on the raw bytes or on UTF-8 text
+CHUNKED_CIPHERS = {XORCipher: 'bytes', VigenereCipher: 'text', CaesarCipher: 'text', CustomMappingCipher: 'text'}
+
+# The cipher each worker process builds once and reuses for every batch it is given
+_worker_cipher = None
+
+
+def _init_worker(cipher) -> None:
+    """
+    Function run once in each worker process to keep hold of the cipher it will use
+    :param
+    cipher: The cipher object made by make_cipher
+    """
+    global _worker_cipher
+    _worker_cipher = cipher
+
+
+def _run_batch(batch: list, decrypt: bool) -> list:
+    """
+    Function run in a worker process to encrypt or decrypt one batch of records
+    :param
+    batch: The records in the batch
+    :param
+    decrypt: Whether to decrypt the records instead of encrypting them
+    :return:
+    The results, in the same order as the batch
+    """
+    method = _worker_cipher.decrypt if decrypt else _worker_cipher.encrypt
+    return [method(record) for record in batch]
+
+
+def _batches(records, batch_size: int):
+    """
+    Generator that groups an iterable of records into lists
+    :param
+    records: Any iterable of records
+    :param
+    batch_size: The number of records in each list, apart from possibly the last one
+    :return:
+    Yields each batch as a list
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _map_records(records, cipher, decrypt: bool, workers: int, batch_size: int):
+    """
+    Generator that runs a cipher over every record, in worker processes when there is more than one worker.
+    Only a couple of batches per worker are in flight at once, so memory stays bounded however many records there are.
+    :param
+    records: Any iterable of records
+    :param
+    cipher: The cipher object made by make_cipher
+    :param
+    decrypt: Whether to decrypt the records instead of encrypting them
+    :param
+    workers: The number of worker processes
+    :param
+    batch_size: The number of records sent to a worker at a time
+    :return:
+    Yields each result in the same order as the records
+    """
+    if workers == 1:
+        method = cipher.decrypt if decrypt else cipher.encrypt
+        for record in records:
+            yield method(record)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cipher,)) as executor:
+        pending = collections.deque()
+        try:
+            for batch in _batches(records, batch_size):
+                pending.append(executor.submit(_run_batch, batch, decrypt))
+                # Wait for the oldest batch once enough work is queued up to keep every worker busy
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Stop any batches that have not started if the caller stops reading results early
+            for future in pending:
+                future.cancel()
+
+
+def _check_pool_arguments(workers, size, size_name: str) -> int:
+    """
+    Function that checks the worker argument and the batch or chunk size argument
+    :param
+    workers: The number of worker processes, or None to use one per CPU
+    :param
+    size: The number of records or bytes sent to a worker at a time
+    :param
+    size_name: What the size is called, for the error message
+    :return:
+    The number of worker processes to use
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError('Workers must be a positive int')
+    if not isinstance(size, int) or size < 1:
+        raise ValueError(size_name + ' must be a positive int')
+    return workers
+
+
+def encrypt_many(records, cipher_spec, workers: int = None, batch_size: int = BATCH_SIZE):
+    """
+    Function that encrypts many independent records with the same cipher
+    :param
+    records: Any iterable of records, each encrypted on its own from the start of the key
+    :param
+    cipher_spec: A cipher name, a tuple like ('vigenere', 'KEY'), or a cipher object, as accepted by make_cipher
+    :param
+    workers: The number of worker processes, 1 to stay in this process, or None to use one per CPU
+    :param
+    batch_size: The number of records sent to a worker at a time
+    :return:
+    An iterator over the encrypted records, in the same order as records
+    """
+    workers = _check_pool_arguments(workers, batch_size, 'Batch size')
+    return _map_records(records, make_cipher(cipher_spec), False, workers, batch_size)
+
+
+def decrypt_many(records, cipher_spec, workers: int = None, batch_size: int = BATCH_SIZE):
+    """
+    Function that decrypts many independent records made by encrypt_many
+    :param
+    records: Any iterable of encrypted records
+    :param
+    cipher_spec: The same cipher spec the records were encrypted with
+    :param
+    workers: The number of worker processes, 1 to stay in this process, or None to use one per CPU
+    :param
+    batch_size: The number of records sent to a worker at a time
+    :return:
+    An iterator over the decrypted records, in the same order as records
+    """
+    workers = _check_pool_arguments(workers, batch_size, 'Batch size')
+    return _map_records(records, make_cipher(cipher_spec), True, workers, batch_size)
+
+
+def _chunk_bounds(data, chunk_size: int, text: bool) -> list:
+    """
+    Function that splits a memory-mapped file into chunks of about chunk_size bytes
+    :param
+    data: The memory-mapped file
+    :param
+    chunk_size: The number of bytes in each chunk, before moving the end to a character boundary
+    :param
+    text: Whether chunks have to end on a UTF-8 character boundary
+    :return:
+    A list of (start, end) byte offsets
+    """
+    bounds = []
+    start = 0
+    while start < len(data):
+        end = min(start + chunk_size, len(data))
+        # Move the end forward past any continuation bytes so no character is split between chunks
+        while text and end < len(data) and data[end] & 0xC0 == 0x80:
+            end += 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _count_characters(source_path: str, start: int, end: int) -> int:
+    """
+    Function run in a worker process to count the UTF-8 characters in one chunk of a file
+    :param
+    source_path: The path of the file
+    :param
+    start: The byte offset where the chunk starts
+    :param
+    end: The byte offset where the chunk ends
+    :return:
+    The number of characters in the chunk
+    """
+    with open(source_path, 'rb') as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return count_utf8_characters(data, start, end)
+
+
+def _transform_chunk(source_path: str, destination_path: str, part_path: str, start: int, end: int, cipher,
+                     position: int, decrypt: bool) -> int:
+    """
+    Function run in a worker process to encrypt or decrypt one chunk of a file into the same place in another file.
+    Non-ASCII letters are shifted onto ASCII letters by the Caesar and Vigenere rule, so a text chunk can change
+    length, and then it is written to a part file of its own instead.
+    :param
+    source_path: The path of the file being read
+    :param
+    destination_path: The path of the file being written, which is already the same size as the source
+    :param
+    part_path: The path the chunk is written to if it changes length
+    :param
+    start: The byte offset where the chunk starts
+    :param
+    end: The byte offset where the chunk ends
+    :param
+    cipher: The cipher object made by make_cipher
+    :param
+    position: The position of the chunk's first byte or character, which decides where in the key to start
+    :param
+    decrypt: Whether to decrypt the chunk instead of encrypting it
+    :return:
+    The number of bytes the chunk became
+    """
+    with open(source_path, 'rb') as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        chunk = data[start:end]
+
+    if CHUNKED_CIPHERS[type(cipher)] == 'bytes':
+        result = bytearray(chunk)
+        cipher.xor_into(result, position)
+    else:
+        method = cipher.decrypt if decrypt else cipher.encrypt
+        text = chunk.decode('utf-8', 'surrogatepass')
+        text = method(text, position) if isinstance(cipher, VigenereCipher) else method(text)
+        result = text.encode('utf-8', 'surrogatepass')
+
+    if len(result) == len(chunk):
+        with open(destination_path, 'r+b') as destination, mmap.mmap(destination.fileno(), 0) as output:
+            output[start:end] = result
+    else:
+        with open(part_path, 'wb') as part:
+            part.write(result)
+    return len(result)
+
+
+def _join_chunks(destination_path: str, joined_path: str, bounds: list, lengths: list, part_paths: list) -> None:
+    """
+    Function that puts the chunks of a file back together in order when some of them changed length.
+    Chunks that kept their length are copied from their place in the destination, and the others from their part
+    files.
+    :param
+    destination_path: The path of the file the chunks that kept their length were written into
+    :param
+    joined_path: The path the whole result is written to
+    :param
+    bounds: The (start, end) byte offsets of every chunk in the source
+    :param
+    lengths: The number of bytes each chunk became
+    :param
+    part_paths: The path of each chunk's part file
+    """
+    with open(destination_path, 'rb') as destination, open(joined_path, 'wb') as joined:
+        for (start, end), length, part_path in zip(bounds, lengths, part_paths):
+            if length == end - start:
+                destination.seek(start)
+                remaining = length
+                while remaining:
+                    block = destination.read(min(remaining, FILE_CHUNK_SIZE))
+                    joined.write(block)
+                    remaining -= len(block)
+            else:
+                with open(part_path, 'rb') as part:
+                    shutil.copyfileobj(part, joined, FILE_CHUNK_SIZE)
+
+
+def _map_file(source_path: str, destination_path: str, cipher, decrypt: bool, workers: int, chunk_size: int) -> int:
+    """
+    Function that encrypts or decrypts a file in chunks, in worker processes when there is more than one worker
+    :param
+    source_path: The path of the file being read
+    :param
+    destination_path: The path of the file being written
+    :param
+    cipher: The cipher object made by make_cipher
+    :param
+    decrypt: Whether to decrypt the file instead of encrypting it
+    :param
+    workers: The number of worker processes
+    :param
+    chunk_size: The number of bytes handed to a worker at a time
+    :return:
+    The number of bytes processed
+    """
+    if type(cipher) not in CHUNKED_CIPHERS:
+        raise ValueError(type(cipher).__name__ + ' cannot encrypt a file in chunks')
+    if os.path.abspath(source_path) == os.path.abspath(destination_path):
+        raise ValueError('Source and destination must be different files')
+
+    text = CHUNKED_CIPHERS[type(cipher)] == 'text'
+    size = os.path.getsize(source_path)
+
+    # Make the destination the same size as the source so every chunk can be written straight to its offset
+    with open(destination_path, 'wb') as destination:
+        destination.truncate(size)
+    if size == 0:
+        return 0
+
+    with open(source_path, 'rb') as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        bounds = _chunk_bounds(data, chunk_size, text)
+
+    if workers == 1:
+        executor = None
+        run = map
+    else:
+        executor = ProcessPoolExecutor(min(workers, len(bounds)))
+        run = executor.map
+
+    directory = os.path.dirname(os.path.abspath(destination_path))
+    try:
+        with tempfile.TemporaryDirectory(dir=directory, prefix='.parts-') as parts_directory:
+            try:
+                starts = [start for start, end in bounds]
+                ends = [end for start, end in bounds]
+                part_paths = [os.path.join(parts_directory, str(number)) for number in range(len(bounds))]
+
+                # The key position of each chunk is the number of bytes, or characters for text, that come before it
+                if isinstance(cipher, VigenereCipher):
+                    counts = list(run(_count_characters, [source_path] * len(bounds), starts, ends))
+                else:
+                    counts = [end - start for start, end in bounds]
+                positions = [0] + list(itertools.accumulate(counts))[:-1]
+
+                lengths = list(run(_transform_chunk, [source_path] * len(bounds), [destination_path] * len(bounds),
+                                   part_paths, starts, ends, [cipher] * len(bounds), positions,
+                                   [decrypt] * len(bounds)))
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+
+            # Only when a text chunk changed length does the file have to be put back together with the chunks moved
+            if lengths != [end - start for start, end in bounds]:
+                joined_path = os.path.join(parts_directory, 'joined')
+                _join_chunks(destination_path, joined_path, bounds, lengths, part_paths)
+                os.replace(joined_path, destination_path)
+    except BaseException:
+        # Don't leave a half written file behind
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        raise
+
+    return size
+
+
+def encrypt_file_parallel(source_path: str, destination_path: str, cipher_spec, workers: int = None,
+                          chunk_size: int = FILE_CHUNK_SIZE) -> int:
+    """
+    Function that encrypts a large file by splitting it into chunks and encrypting them in worker processes.
+    Each chunk is given the key position it would have had in one long pass, so the output is identical to the
+    serial stream methods: XOR works on the raw bytes, and the other ciphers on UTF-8 text.
+    :param
+    source_path: The path of the file to encrypt
+    :param
+    destination_path: The path the encrypted file is written to
+    :param
+    cipher_spec: A spec for XORCipher, VigenereCipher, CaesarCipher or CustomMappingCipher, as accepted by make_cipher
+    :param
+    workers: The number of worker processes, 1 to stay in this process, or None to use one per CPU
+    :param
+    chunk_size: The number of bytes handed to a worker at a time
+    :return:
+    The number of bytes encrypted
+    """
+    workers = _check_pool_arguments(workers, chunk_size, 'Chunk size')
+    return _map_file(source_path, destination_path, make_cipher(cipher_spec), False, workers, chunk_size)
+
+
+def decrypt_file_parallel(source_path: str, destination_path: str, cipher_spec, workers: int = None,
+                          chunk_size: int = FILE_CHUNK_SIZE) -> int:
+    """
+    Function that decrypts a file made by encrypt_file_parallel, or by the matching serial stream method
+    :param
+    source_path: The path of the encrypted file
+    :param
+    destination_path: The path the decrypted file is written to
+    :param
+    cipher_spec: The same cipher spec the file was encrypted with
+    :param
+    workers: The number of worker processes, 1 to stay in this process, or None to use one per CPU
+    :param
+    chunk_size: The number of bytes handed to a worker at a time
+    :return:
+    The number of bytes decrypted
+    """
+    workers = _check_pool_arguments(workers, chunk_size, 'Chunk size')
+    return _map_file(source_path, destination_path, make_cipher(cipher_spec), True, workers, chunk_size)
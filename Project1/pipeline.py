@@ -0,0 +1,277 @@
+"""
+This is a pipeline for chaining the ciphers from encrypt.py together, fusing neighbouring stages so the whole chain
+can run over the text in as few passes as possible.
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import math
+from encrypt import (Salting, ReverseCipher1, ReverseCipher2, XORCipher, CaesarCipher, VigenereCipher,
+                     CustomMappingCipher, np)
+
+# Ciphers that map each character on its own, and whether the mapping depends on the character's position
+CHARACTER_CIPHERS = {CaesarCipher: False, CustomMappingCipher: False, XORCipher: True, VigenereCipher: True}
+
+# Ciphers that move characters around or change the length, so they have to run on the whole text by themselves
+WHOLE_TEXT_CIPHERS = (Salting, ReverseCipher1, ReverseCipher2)
+
+# Largest combined key period that neighbouring stages are fused into
+MAX_FUSED_PERIOD = 1024
+
+
+class _PhaseTable(dict):
+    """
+    Translation table for every character at one key position of a fused group of stages.
+    Each character is pushed through all of the stages the first time it is seen, and the result is remembered.
+    """
+
+    def __init__(self, functions: list, phase: int) -> None:
+        """
+        Constructor method that takes in the stages and the key position this table is for
+        :param
+        functions: A list of (function, period) pairs, where function takes (character, phase)
+        :param
+        phase: The position within the combined key period that this table handles
+        """
+        super().__init__()
+        self.functions = functions
+        self.phase = phase
+
+    def __missing__(self, code: int) -> int:
+        """
+        Built-in python method called by str.translate for characters that are not in the table yet
+        :param
+        code: The code point of the character
+        :return:
+        The code point of the character after every stage has been applied
+        """
+        char = chr(code)
+        for function, period in self.functions:
+            char = function(char, self.phase % period)
+
+        self[code] = ord(char)
+        return self[code]
+
+
+class _FusedPass:
+    """
+    Several character ciphers compiled into one translation table per position of their combined key period
+    """
+
+    def __init__(self, functions: list, period: int) -> None:
+        """
+        Constructor method that takes in the stages to fuse
+        :param
+        functions: A list of (function, period) pairs, where function takes (character, phase)
+        :param
+        period: The least common multiple of the stage periods
+        """
+        self.period = period
+        self.tables = [_PhaseTable(functions, phase) for phase in range(period)]
+        # NumPy lookup table of ASCII characters at every phase, and which characters have been filled in so far.
+        # Only characters that turn up in the text are filled in, since a stage may not accept every character.
+        self._ascii_lookup = None
+        self._ascii_filled = None
+
+    def __call__(self, text: str) -> str:
+        """
+        Built-in python method that runs every fused stage over the text
+        :param
+        text: The string input going through the fused stages
+        :return:
+        The transformed text
+        """
+        if np is not None and text.isascii():
+            return self._call_ascii(text)
+        if self.period == 1:
+            return text.translate(self.tables[0])
+
+        # Translate every phase-th character with its own table, then weave the results back together
+        chars = list(text)
+        for phase, table in enumerate(self.tables):
+            chars[phase::self.period] = text[phase::self.period].translate(table)
+        return ''.join(chars)
+
+    def _call_ascii(self, text: str) -> str:
+        """
+        Method that runs every fused stage over ASCII text with a single NumPy lookup
+        :param
+        text: The ASCII string input going through the fused stages
+        :return:
+        The transformed text
+        """
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        self._fill_ascii(codes)
+
+        # The row for each phase starts at phase * 128 in the flattened table, so add that to each character code
+        row_starts = np.arange(0, self.period * 128, 128, dtype=np.uint32)
+        indexes = np.tile(row_starts, len(codes) // self.period + 1)[:len(codes)]
+        indexes += codes
+        result = self._ascii_lookup.take(indexes)
+
+        if result.dtype == np.uint8:
+            return result.tobytes().decode('ascii')
+        return result.tobytes().decode('utf-32-le', 'surrogatepass')
+
+    def _fill_ascii(self, codes) -> None:
+        """
+        Method that adds the characters of some text to the NumPy lookup table, if they are not in it yet
+        :param
+        codes: A uint8 array of the ASCII character codes of the text
+        """
+        if self._ascii_lookup is None:
+            # The table is kept as bytes while every result is ASCII too, which makes the lookup cheaper
+            self._ascii_lookup = np.zeros(self.period * 128, dtype=np.uint8)
+            self._ascii_filled = np.zeros(128, dtype=bool)
+
+        present = np.bincount(codes, minlength=128).astype(bool)
+        for code in np.flatnonzero(present & ~self._ascii_filled):
+            results = [table[int(code)] for table in self.tables]
+            if max(results) > 127 and self._ascii_lookup.dtype == np.uint8:
+                self._ascii_lookup = self._ascii_lookup.astype(np.uint32)
+            self._ascii_lookup[code::128] = results
+            self._ascii_filled[code] = True
+
+
+def _stage_function(stage, decrypt: bool):
+    """
+    Function that wraps a character cipher as a function of (character, phase)
+    :param
+    stage: A cipher object from encrypt.py
+    :param
+    decrypt: Whether to wrap the stage's decrypt method instead of its encrypt method
+    :return:
+    A (function, period) pair
+    """
+    method = stage.decrypt if decrypt else stage.encrypt
+
+    if CHARACTER_CIPHERS[type(stage)]:
+        if not stage.key:
+            raise ValueError('Key must not be empty')
+        return (lambda char, phase: method(char, phase)), len(stage.key)
+    return (lambda char, phase: method(char)), 1
+
+
+def _compile(stages: list, decrypt: bool, max_fused_period: int) -> list:
+    """
+    Function that turns a list of stages into the passes that run them, fusing neighbouring character ciphers
+    :param
+    stages: The cipher objects in the order they are applied
+    :param
+    decrypt: Whether the passes should undo the stages instead
+    :param
+    max_fused_period: The largest combined key period that a fused pass may have
+    :return:
+    A list of functions that each take and return a string
+    """
+    passes = []
+    group = []
+    group_period = 1
+
+    def flush():
+        if len(group) == 1:
+            # A lone stage is quicker through its own method, which has its own fast paths
+            passes.append(group[0][2])
+        elif group:
+            passes.append(_FusedPass([(function, period) for function, period, method in group], group_period))
+        group.clear()
+
+    for stage in stages:
+        method = stage.decrypt if decrypt else stage.encrypt
+
+        if isinstance(stage, WHOLE_TEXT_CIPHERS):
+            flush()
+            group_period = 1
+            passes.append(method)
+            continue
+
+        function, period = _stage_function(stage, decrypt)
+        combined_period = group_period * period // math.gcd(group_period, period)
+        if group and combined_period > max_fused_period:
+            flush()
+            combined_period = period
+
+        group.append((function, period, method))
+        group_period = combined_period
+
+    flush()
+    return passes
+
+
+class CipherPipeline:
+    def __init__(self, stages: list, max_fused_period: int = MAX_FUSED_PERIOD) -> None:
+        """
+        Constructor method that takes in the ciphers to chain and compiles them into passes
+        :param
+        stages: The cipher objects from encrypt.py, in the order they are applied. Their keys are used,
+        but the text they were made with is not, so they can be made with empty text
+        :param
+        max_fused_period: The largest combined key period that neighbouring stages are fused into
+        """
+        # Ensures that every stage is one of the ciphers, and raises a TypeError if one isn't.
+        for stage in stages:
+            if type(stage) not in CHARACTER_CIPHERS and not isinstance(stage, WHOLE_TEXT_CIPHERS):
+                raise TypeError('Stages must be ciphers from encrypt.py')
+        if not isinstance(max_fused_period, int) or max_fused_period < 1:
+            raise ValueError('Max fused period must be a positive int')
+
+        self.stages = list(stages)
+        self.inverted = False
+        self._encrypt_passes = _compile(self.stages, False, max_fused_period)
+        self._decrypt_passes = _compile(self.stages[::-1], True, max_fused_period)
+
+    @property
+    def pass_count(self) -> int:
+        """
+        Property for the number of passes made over the text when encrypting
+        :return:
+        The number of passes
+        """
+        return len(self._encrypt_passes)
+
+    def encrypt(self, text: str) -> str:
+        """
+        Method that runs every stage of the pipeline over the text
+        :param
+        text: The string input going through the pipeline
+        :return:
+        The encrypted text
+        """
+        if not isinstance(text, str):
+            raise TypeError('Text must be a string')
+
+        for run in self._encrypt_passes:
+            text = run(text)
+        return text
+
+    def decrypt(self, cipher_text: str) -> str:
+        """
+        Method that undoes every stage of the pipeline, last stage first
+        :param
+        cipher_text: The string input made by encrypt
+        :return:
+        The decrypted text
+        """
+        if not isinstance(cipher_text, str):
+            raise TypeError('Cipher text must be a string')
+
+        for run in self._decrypt_passes:
+            cipher_text = run(cipher_text)
+        return cipher_text
+
+    def inverse(self) -> 'CipherPipeline':
+        """
+        Method that makes the matching pipeline for decryption, whose encrypt undoes this pipeline's encrypt
+        :return:
+        The inverse pipeline, sharing this pipeline's compiled passes
+        """
+        inverse = CipherPipeline.__new__(CipherPipeline)
+        inverse.stages = self.stages
+        inverse.inverted = not self.inverted
+        inverse._encrypt_passes = self._decrypt_passes
+        inverse._decrypt_passes = self._encrypt_passes
+        return inverse
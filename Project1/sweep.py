@@ -0,0 +1,207 @@
+"""
+This is a helper for encrypting one text under many keys at once with the Caesar, Vigenere and XOR ciphers from
+encrypt.py, for making test vectors and for searching through keys.
+The text is turned into an array once, and every key's result is one row of a single 2D NumPy array, so it needs
+NumPy installed.
+
+Name: Dominik Pathuis
+
+Date: 10/18/2026
+
+Version: Python 3.9
+"""
+
+import numpy as np
+from encrypt import caesar_table, vigenere_shifts
+
+# Ciphers that sweep can run, by their name in encrypt.CIPHERS
+SWEEP_CIPHERS = ('caesar', 'vigenere', 'xor')
+
+
+class SweepResult:
+    """
+    The results of one text under many keys, held as a single 2D array with one row per key.
+    A row is only turned back into a string when it is asked for.
+    """
+
+    def __init__(self, keys: list, array: np.ndarray, binary: bool) -> None:
+        """
+        Constructor method that takes in the keys and the array of results
+        :param
+        keys: The keys, in the same order as the rows
+        :param
+        array: The 2D array of result code points, or bytes for binary results
+        :param
+        binary: Whether the rows are bytes instead of text
+        """
+        self.keys = keys
+        self.array = array
+        self.binary = binary
+
+    def __getitem__(self, number: int):
+        """
+        Built-in python method that turns one row back into the text it stands for
+        :param
+        number: The row number, which is the key's position in keys
+        :return:
+        The result for that key, as a string, or as bytes for binary results
+        """
+        row = self.array[number]
+        if self.binary:
+            return row.tobytes()
+        if row.dtype == np.uint8:
+            return row.tobytes().decode('ascii')
+        return row.tobytes().decode('utf-32-le', 'surrogatepass')
+
+    def __len__(self) -> int:
+        """
+        Built-in python method to return the number of keys
+        :return:
+        The number of keys
+        """
+        return len(self.keys)
+
+    def __iter__(self):
+        """
+        Built-in python method that turns the rows back into text one at a time
+        :return:
+        Yields the result for each key, in order
+        """
+        for number in range(len(self.keys)):
+            yield self[number]
+
+    def items(self):
+        """
+        Method that pairs every key with its result, turning the rows back into text one at a time
+        :return:
+        Yields a (key, result) pair for each key, in order
+        """
+        for number, key in enumerate(self.keys):
+            yield key, self[number]
+
+
+def _codes(text: str) -> np.ndarray:
+    """
+    Function that turns text into an array of code points
+    :param
+    text: The string input to convert
+    :return:
+    A uint8 array for ASCII text, which keeps the results small, or a uint32 array otherwise
+    """
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+def _shift_rows(codes: np.ndarray, shifts: np.ndarray) -> np.ndarray:
+    """
+    Function that shifts the letters of one text by many sets of shifts at once, the way the Caesar and Vigenere
+    ciphers do.
+    Every distinct character of the text is shifted by all 26 shifts once with the Caesar tables, and then every
+    result is just looked up in that small table, so non-ASCII letters come out exactly like the ciphers too.
+    :param
+    codes: The code points of the text
+    :param
+    shifts: A 2D array with the shifts in the range 0-25 of one key per row, which all have the same length and are
+    repeated along the text
+    :return:
+    A 2D array with the shifted code points of the text for every row of shifts
+    """
+    unique, inverse = np.unique(codes, return_inverse=True)
+    characters = unique.tobytes().decode('ascii') if codes.dtype == np.uint8 else \
+        unique.astype(np.uint32).tobytes().decode('utf-32-le', 'surrogatepass')
+    # The lookups are left out of caesar_table_stats, which are meant to show tables being reused between messages
+    table = np.stack([_codes(characters.translate(caesar_table(shift, count=False))).astype(codes.dtype)
+                      for shift in range(26)])
+
+    # Row r of the key table holds what every distinct character becomes at each key position of key r, so the
+    # result for the whole text is one lookup with the same column numbers for every key
+    key_tables = table[shifts].reshape(len(shifts), -1)
+    columns = np.arange(len(codes)) % shifts.shape[1] * len(unique) + inverse
+    return key_tables[:, columns]
+
+
+def _tiled(key_codes: np.ndarray, length: int) -> np.ndarray:
+    """
+    Function that repeats keys of the same length along the text
+    :param
+    key_codes: A 2D array with one key per row
+    :param
+    length: The length of the text
+    :return:
+    A 2D array with each key repeated to the length of the text
+    """
+    return key_codes[:, np.arange(length) % key_codes.shape[1]]
+
+
+def _by_length(keys: list) -> dict:
+    """
+    Function that groups keys by their length, so each group can be lined up with the text in one go
+    :param
+    keys: The keys
+    :return:
+    A dictionary from each key length to the positions of the keys with that length
+    """
+    groups = {}
+    for number, key in enumerate(keys):
+        groups.setdefault(len(key), []).append(number)
+    return groups
+
+
+def sweep(text, keys, cipher: str = 'caesar', decrypt: bool = False) -> SweepResult:
+    """
+    Function that encrypts one text under many keys at once, giving the same results as making a cipher for every key
+    :param
+    text: The string input to encrypt, or a bytes-like object for the xor cipher, which then works on the bytes
+    like XORCipher.xor_bytes
+    :param
+    keys: Any iterable of keys, which are ints for the caesar cipher and strings for the others
+    :param
+    cipher: The name of the cipher, which is one of SWEEP_CIPHERS
+    :param
+    decrypt: Whether to decrypt the text under every key instead of encrypting it
+    :return:
+    A SweepResult with one row for every key
+    """
+    if cipher not in SWEEP_CIPHERS:
+        raise ValueError('Cipher must be one of ' + ', '.join(SWEEP_CIPHERS))
+
+    binary = isinstance(text, (bytes, bytearray, memoryview))
+    if binary and cipher != 'xor':
+        raise TypeError('Only the xor cipher can sweep bytes')
+    if not binary and not isinstance(text, str):
+        raise TypeError('Text must be a string')
+
+    keys = list(keys)
+    key_type = int if cipher == 'caesar' else str
+    for key in keys:
+        if not isinstance(key, key_type) or isinstance(key, bool):
+            raise TypeError('Keys must be ' + ('ints' if key_type is int else 'strings'))
+        if key_type is str and not key:
+            raise ValueError('Keys must not be empty')
+
+    codes = np.frombuffer(text, dtype=np.uint8) if binary else _codes(text)
+    if not keys:
+        return SweepResult(keys, np.empty((0, len(codes)), dtype=codes.dtype), binary)
+
+    if cipher == 'caesar':
+        shifts = np.array([(-key if decrypt else key) % 26 for key in keys], dtype=np.intp).reshape(-1, 1)
+        return SweepResult(keys, _shift_rows(codes, shifts), binary)
+
+    if cipher == 'xor':
+        key_codes = [list(key.encode('utf-8')) if binary else [ord(char) for char in key] for key in keys]
+        # The results stay ASCII when both the text and every key are ASCII
+        if not binary and codes.dtype == np.uint8 and not all(key.isascii() for key in keys):
+            codes = codes.astype(np.uint32)
+    else:
+        key_codes = [vigenere_shifts(key, decrypt) for key in keys]
+
+    array = np.empty((len(keys), len(codes)), dtype=codes.dtype)
+    for numbers in _by_length(key_codes).values():
+        group = np.array([key_codes[number] for number in numbers], dtype=codes.dtype if cipher == 'xor' else np.intp)
+        if cipher == 'xor':
+            array[numbers] = codes ^ _tiled(group, len(codes))
+        else:
+            array[numbers] = _shift_rows(codes, group)
+
+    return SweepResult(keys, array, binary)
@@ -8,9 +8,32 @@ Date: 9/23/2024
 Version: Python 3.9
 """
 
+import asyncio
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import struct
+import tempfile
+import time
 import unittest
+from unittest import mock
 from encrypt import (Salting, ReverseCipher1, ReverseCipher2, XORCipher, CaesarCipher, VigenereCipher,
-                     CustomMappingCipher)
+                     CustomMappingCipher, caesar_bytes, caesar_table, caesar_table_stats, clear_caesar_tables,
+                     make_cipher, main, vigenere_bytes, vigenere_shifts, np)
+from aio import benchmark_echo, open_encrypted_connection, start_encrypted_server
+from benchmark import compare, main as benchmark_main, run_suite
+from container import ContainerWriter, ContainerReader
+import metrics
+from parallel import encrypt_many, decrypt_many, encrypt_file_parallel, decrypt_file_parallel
+from pipeline import CipherPipeline
+
+# The cryptanalysis tools need NumPy, so their tests are skipped without it
+if np is not None:
+    from cryptanalysis import (crack_caesar, crack_vigenere, crack_xor, estimate_vigenere_key_length,
+                               solve_substitution)
+    from sweep import sweep
 
 
 class CipherTests(unittest.TestCase):
@@ -24,6 +47,46 @@ class CipherTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             Salting('Hello', 123)
 
+    def test_salted_view(self):
+        my_salt = Salting('', 'gvsu')
+        view = my_salt.salted_view('Hello')
+        self.assertEqual(len(view), 9)
+        self.assertEqual(view, 'Hellogvsu')
+        self.assertNotEqual(view, 'Hellogvsx')
+        self.assertEqual((view[0], view[-1], view[3:7], view[::-1]), ('H', 'u', 'logv', 'usvgolleH'))
+        self.assertIs(my_salt.decrypt(view), view.payload)
+        self.assertEqual(my_salt.decrypt('Hellogvsu'), 'Hello')
+        self.assertEqual(Salting('', '').decrypt('Hello'), 'Hello')
+
+        # A bytes payload is referenced, not copied
+        payload = bytearray(b'Hello')
+        view = my_salt.salted_view(payload)
+        payload[0] = ord('J')
+        self.assertEqual(view, b'Jellogvsu')
+        writer = io.BytesIO()
+        self.assertEqual(view.write_to(writer), 9)
+        self.assertEqual(writer.getvalue(), b'Jellogvsu')
+
+    def test_salt_and_unsalt_file(self):
+        my_salt = Salting('', 'gvsu—lakers')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'payload.bin')
+            with open(path, 'wb') as file:
+                file.write(b'Hello, Students')
+
+            self.assertEqual(my_salt.salt_file(path), 15 + len('gvsu—lakers'.encode('utf-8')))
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), 'Hello, Studentsgvsu—lakers'.encode('utf-8'))
+
+            self.assertEqual(my_salt.unsalt_file(path, truncate=False), 15)
+            self.assertEqual(os.path.getsize(path), 15 + len('gvsu—lakers'.encode('utf-8')))
+            self.assertEqual(my_salt.unsalt_file(path), 15)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), b'Hello, Students')
+
+            with self.assertRaises(ValueError):
+                my_salt.unsalt_file(path)
+
     def test_reverse_cipher1(self):
         rev1 = ReverseCipher1('Hello')
         self.assertEqual(str(rev1), 'Hello')
@@ -32,6 +95,29 @@ class CipherTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             ReverseCipher1(123)
 
+    def test_reverse_cipher1_file(self):
+        text = 'Hello, Wörld! Ünïcödé 🎉\n' * 50
+        rev1 = ReverseCipher1('')
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'plain.txt')
+            encrypted = os.path.join(directory, 'encrypted.txt')
+            decrypted = os.path.join(directory, 'decrypted.txt')
+            with open(source, 'w', encoding='utf-8', newline='') as file:
+                file.write(text)
+
+            rev1.encrypt_file(source, encrypted, block_size=5)
+            rev1.decrypt_file(encrypted, decrypted, block_size=7)
+
+            with open(encrypted, encoding='utf-8', newline='') as file:
+                self.assertEqual(file.read(), text[::-1])
+            with open(decrypted, encoding='utf-8', newline='') as file:
+                self.assertEqual(file.read(), text)
+
+            with self.assertRaises(ValueError):
+                rev1.encrypt_file(source, os.path.join(directory, '.', 'plain.txt'))
+            self.assertEqual(os.path.getsize(source), len(text.encode('utf-8')))
+
     def test_reverse_cipher2(self):
         rev2 = ReverseCipher2('Hello World')
         self.assertEqual(str(rev2), 'Hello World')
@@ -40,6 +126,11 @@ class CipherTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             ReverseCipher2(123)
 
+    def test_reverse_cipher2_keeps_whitespace(self):
+        rev2 = ReverseCipher2('  Hello,\tWorld\n\nGVSU  ')
+        self.assertEqual(rev2.cipher_text, '  ,olleH\tdlroW\n\nUSVG  ')
+        self.assertEqual(str(rev2), '  Hello,\tWorld\n\nGVSU  ')
+
     def test_xor_cipher(self):
         xor1 = XORCipher('Hello, Students', 'gvsu')
         self.assertEqual(str(xor1), 'Hello, Students')
@@ -50,6 +141,58 @@ class CipherTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             XORCipher('Hello, Students', 123)
 
+    def test_xor_decrypt_range(self):
+        xor1 = XORCipher('Hello, Students', 'gvsu')
+        self.assertEqual(xor1.decrypt_range(5, 11), ', Stud')
+        self.assertEqual(xor1.decrypt_range(13, 99), 'ts')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'encrypted.bin')
+            with open(path, 'wb') as file:
+                file.write(xor1.xor_bytes(b'Hello, Students'))
+            self.assertEqual(xor1.decrypt_file_range(path, 7, 10), b'Stu')
+
+        with self.assertRaises(ValueError):
+            xor1.decrypt_range(5, 2)
+
+    def test_xor_bytes(self):
+        xor1 = XORCipher('', 'gvsu')
+        data = b'Hello, Students'
+        self.assertEqual(xor1.xor_bytes(data), XORCipher('Hello, Students', 'gvsu').cipher_text.encode('latin-1'))
+        self.assertEqual(xor1.xor_bytes(xor1.xor_bytes(data)), data)
+        self.assertEqual(xor1.xor_bytes(data[5:], offset=5), xor1.xor_bytes(data)[5:])
+
+        buffer = bytearray(data)
+        xor1.xor_into(memoryview(buffer)[3:], offset=3)
+        self.assertEqual(bytes(buffer), data[:3] + xor1.xor_bytes(data)[3:])
+
+        with self.assertRaises(TypeError):
+            xor1.xor_into(b'read only')
+
+    def test_xor_file_inplace(self):
+        xor1 = XORCipher('', 'Grand Valley')
+        data = os.urandom(50000)
+        calls = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as file:
+                file.write(data)
+
+            self.assertEqual(xor1.xor_file_inplace(path, 1, lambda *report: calls.append(report)), len(data))
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), xor1.xor_bytes(data))
+            self.assertEqual(calls[-1][:2], (len(data), len(data)))
+            self.assertGreater(len(calls), 1)
+
+            xor1.xor_file_inplace(path)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), data)
+
+            # An empty file is left alone
+            open(path, 'wb').close()
+            self.assertEqual(xor1.xor_file_inplace(path), 0)
+
     def test_caesar_cipher(self):
         caesar = CaesarCipher('HELLO', 3)
         self.assertEqual(str(caesar), 'HELLO')
@@ -60,6 +203,23 @@ class CipherTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             CaesarCipher('HELLO', 'three')
 
+    def test_caesar_table_cache(self):
+        clear_caesar_tables()
+        caesar = CaesarCipher('Hello, World! Ä', 29)
+        # Non-ASCII letters are shifted the same way the original character loop shifted them
+        self.assertEqual(caesar.cipher_text, 'Khoor, Zruog! ' + chr((ord('Ä') - ord('A') + 3) % 26 + ord('A')))
+        self.assertEqual(CaesarCipher('abc', -23).cipher_text, 'def')
+        self.assertEqual(caesar_table_stats(), {'hits': 1, 'misses': 1, 'tables': 1})
+        str(caesar)
+        self.assertEqual(caesar_table_stats()['tables'], 2)
+
+        # Characters past the cache limit that are not letters are passed through without being remembered
+        table = caesar_table(3, count=False)
+        size = len(table)
+        text = ''.join(chr(code) for code in range(0x4E00, 0x5200)) + '🎉'
+        self.assertEqual(CaesarCipher(text, 3).cipher_text, text)
+        self.assertEqual(len(table), size)
+
     def test_vigenere_cipher(self):
         vigenere = VigenereCipher('HELLO', 'KEY')
         self.assertEqual(str(vigenere), 'HELLO')
@@ -69,6 +229,65 @@ class CipherTests(unittest.TestCase):
             VigenereCipher(123, 'KEY')
         with self.assertRaises(TypeError):
             VigenereCipher('HELLO', 123)
+        with self.assertRaises(ValueError):
+            VigenereCipher('HELLO', 'KEY', backend='fortran')
+
+    def test_vigenere_decrypt_range(self):
+        text = 'Hello — Students, 100€ to GVSU!'
+        vigenere = VigenereCipher(text, 'KEY')
+        self.assertEqual(vigenere.decrypt_range(10, 18), text[10:18])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'encrypted.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(vigenere.cipher_text)
+
+            start = len(text[:10].encode('utf-8'))
+            stop = start + len(text[10:18].encode('utf-8'))
+            self.assertEqual(vigenere.decrypt_file_range(path, start, stop), text[10:18])
+            self.assertEqual(vigenere.decrypt_file_range(path, start, stop, position=10), text[10:18])
+
+            with self.assertRaises(ValueError):
+                vigenere.decrypt_file_range(path, 7, 12)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_vigenere_backends_match(self):
+        text = 'Hello, Students! Welcome to GVSU. Ünïcödé Ä ß \t\n 12345 ' * 30
+        for key in ('KEY', 'gvsu2024', 'a-Z!'):
+            python = VigenereCipher(text, key, backend='python')
+            numpy = VigenereCipher(text, key, backend='numpy')
+            self.assertEqual(numpy.cipher_text, python.cipher_text)
+            self.assertEqual(str(numpy), str(python))
+            self.assertEqual(numpy.decrypt_vigenere(python.cipher_text[7:], key, offset=7), str(python)[7:])
+
+    def test_ascii_fast_paths_match_character_paths(self):
+        text = 'Hello, Students! Welcome to GVSU. \t\n 12345 ~'
+        for key in ('KEY', 'gvsu2024', 'a-Z!', 'x' * 100):
+            vigenere = VigenereCipher('', key, backend='python')
+            # Adding a non-ASCII character sends the text down the character by character path
+            self.assertEqual(vigenere.encrypt(text, 3), vigenere.encrypt(text + '€', 3)[:-1])
+            self.assertEqual(vigenere_bytes(text.encode('ascii'), vigenere_shifts(key), 3).decode('ascii'),
+                             vigenere.encrypt(text, 3))
+
+            xor1 = XORCipher('', key)
+            self.assertEqual(xor1.encrypt(text, 5), xor1.xor_words(text, key, 5))
+
+        # An empty key is rejected instead of turning the text into NULs
+        for backend in VigenereCipher.BACKENDS if np is not None else ('auto', 'python'):
+            with self.assertRaises(ValueError):
+                VigenereCipher('Hello', '', backend=backend)
+            with self.assertRaises(ValueError):
+                VigenereCipher('', '', backend=backend).decrypt('Hello')
+        with self.assertRaises(ValueError):
+            vigenere_bytes(b'abc', ())
+
+        self.assertEqual(caesar_bytes(b'Hello, GVSU!', 29), CaesarCipher('Hello, GVSU!', 3).cipher_text.encode('ascii'))
+
+        my_map = CustomMappingCipher('', unmapped='replace')
+        self.assertEqual(my_map.map_bytes(b'Hi\tGVSU'), my_map.encrypt('Hi\tGVSU').encode('ascii'))
+        self.assertEqual(my_map.map_bytes(my_map.map_bytes(b'Hi GVSU'), 'decrypt'), b'Hi GVSU')
+        with self.assertRaises(ValueError):
+            CustomMappingCipher('', unmapped='strict').map_bytes(b'Hi\n')
 
     def test_custom_mapping_cipher(self):
         my_map = CustomMappingCipher('Hello Students. Welcome to GVSU!')
@@ -78,4 +297,661 @@ class CipherTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             CustomMappingCipher(123)
 
+    def test_lazy_cipher_text_and_cached_plain_text(self):
+        # Nothing is encrypted until cipher_text is used, so the bad character is only found then
+        my_map = CustomMappingCipher('Hello\n', unmapped='strict', lazy=True)
+        with self.assertRaises(ValueError):
+            my_map.cipher_text
+
+        vigenere = VigenereCipher('HELLO', 'KEY', lazy=True)
+        self.assertEqual(vigenere.cipher_text, 'RIJVS')
+        self.assertIs(str(vigenere), str(vigenere))
+        vigenere.cipher_text = 'RIJVSUYVJN'
+        self.assertEqual(str(vigenere), 'HELLOWORLD')
+
+        # Changing the key forgets the remembered text, so str() still matches decrypt
+        vigenere.key = 'ABC'
+        self.assertEqual(str(vigenere), vigenere.decrypt(vigenere.cipher_text))
+        salting = Salting('Hello', 'gvsu')
+        self.assertEqual(str(salting), 'Hello')
+        salting.salt = 'su'
+        self.assertEqual(str(salting), salting.decrypt(salting.cipher_text))
+
+        # Changing the key forgets the remembered text, so str() still matches decrypt
+        vigenere.key = 'ABC'
+        self.assertEqual(str(vigenere), vigenere.decrypt(vigenere.cipher_text))
+        salting = Salting('Hello', 'gvsu')
+        self.assertEqual(str(salting), 'Hello')
+        salting.salt = 'su'
+        self.assertEqual(str(salting), salting.decrypt(salting.cipher_text))
+
+    def test_ciphers_use_slots(self):
+        ciphers = [Salting('Hello', 'gvsu'), ReverseCipher1('Hello'), ReverseCipher2('Hello'), XORCipher('Hello', 'gvsu'),
+                   CaesarCipher('Hello', 3), VigenereCipher('Hello', 'KEY'), CustomMappingCipher('Hello')]
+        for cipher in ciphers:
+            self.assertFalse(hasattr(cipher, '__dict__'))
+            with self.assertRaises(AttributeError):
+                cipher.extra = 1
+
+    def test_custom_mapping_unmapped_policies(self):
+        self.assertEqual(CustomMappingCipher('ab\ncd').cipher_text, ',c\n/&')
+        self.assertEqual(str(CustomMappingCipher('ab\ncd')), 'ab\ncd')
+        self.assertEqual(CustomMappingCipher('ab\ncd', unmapped='replace', replacement='_').cipher_text, ',c_/&')
+
+        with self.assertRaises(ValueError):
+            CustomMappingCipher('ab\ncd', unmapped='strict')
+        with self.assertRaises(ValueError):
+            CustomMappingCipher('abcd', unmapped='ignore')
+        with self.assertRaises(TypeError):
+            CustomMappingCipher('abcd', unmapped='replace', replacement='??')
+
+
+class StreamTests(unittest.TestCase):
+    def setUp(self):
+        self.text = 'Hello, Students. Welcome to GVSU! ' * 20
+
+    def stream(self, method, text, chunk_size):
+        writer = io.StringIO()
+        method(io.StringIO(text), writer, chunk_size=chunk_size)
+        return writer.getvalue()
+
+    def test_streams_match_eager_ciphers(self):
+        ciphers = [Salting(self.text, 'gvsulakers'), ReverseCipher1(self.text), ReverseCipher2(self.text),
+                   XORCipher(self.text, 'gvsu'), CaesarCipher(self.text, 3), VigenereCipher(self.text, 'KEY'),
+                   CustomMappingCipher(self.text)]
+
+        for cipher in ciphers:
+            for chunk_size in (1, 7, 64, 4096):
+                encrypted = self.stream(cipher.encrypt_stream, self.text, chunk_size)
+                self.assertEqual(encrypted, cipher.cipher_text)
+                self.assertEqual(self.stream(cipher.decrypt_stream, encrypted, chunk_size), str(cipher))
+
+    def test_reverse_cipher2_stream_word_boundaries(self):
+        rev2 = ReverseCipher2('')
+        self.assertEqual(self.stream(rev2.encrypt_stream, 'Hello World', 3), 'olleH dlroW')
+        self.assertEqual(self.stream(rev2.encrypt_stream, ' ab\tcd \n', 3), ' ba\tdc \n')
+        self.assertEqual(self.stream(rev2.encrypt_stream, 'abcdefgh ij', 3), 'hgfedcba ji')
+
+    def test_xor_binary_stream(self):
+        xor1 = XORCipher('', 'gvsu')
+        data = bytes(range(256)) * 10
+        writer = io.BytesIO()
+        xor1.encrypt_stream(io.BytesIO(data), writer, chunk_size=7)
+        self.assertEqual(writer.getvalue(), xor1.xor_bytes(data))
+
+    def test_stream_chunk_size(self):
+        with self.assertRaises(ValueError):
+            self.stream(CaesarCipher('', 3).encrypt_stream, 'HELLO', 0)
+
+
+class PipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.text = 'Hello, Students.\tWelcome to GVSU! ' * 10
+
+    def chain(self, stages, text):
+        for stage in stages:
+            text = stage.encrypt(text)
+        return text
+
+    def test_fused_pipeline_matches_chained_ciphers(self):
+        stages = [CaesarCipher('', 3), VigenereCipher('', 'KEY'), XORCipher('', 'gvsu'), CustomMappingCipher('')]
+        pipeline = CipherPipeline(stages)
+        self.assertEqual(pipeline.pass_count, 1)
+
+        encrypted = pipeline.encrypt(self.text)
+        self.assertEqual(encrypted, self.chain(stages, self.text))
+        self.assertEqual(pipeline.decrypt(encrypted), self.text)
+        self.assertEqual(pipeline.inverse().encrypt(encrypted), self.text)
+
+    def test_fused_pipeline_with_strict_mapping(self):
+        stages = [CaesarCipher('', 3), CustomMappingCipher('', unmapped='strict')]
+        pipeline = CipherPipeline(stages)
+        self.assertEqual(pipeline.pass_count, 1)
+        self.assertEqual(pipeline.encrypt('hello world'), self.chain(stages, 'hello world'))
+        self.assertEqual(pipeline.decrypt(pipeline.encrypt('hello world')), 'hello world')
+
+        # Only characters that are really in the text have to be mapped
+        with self.assertRaises(ValueError):
+            pipeline.encrypt('hello\tworld')
+        self.assertEqual(pipeline.encrypt('Hello World'), self.chain(stages, 'Hello World'))
+
+    def test_pipeline_with_whole_text_stages(self):
+        stages = [CaesarCipher('', 3), ReverseCipher1(''), VigenereCipher('', 'KEY'), Salting('', 'gvsu')]
+        pipeline = CipherPipeline(stages, max_fused_period=2)
+        self.assertEqual(pipeline.pass_count, 4)
+
+        encrypted = pipeline.encrypt(self.text)
+        self.assertEqual(encrypted, self.chain(stages, self.text))
+        self.assertEqual(pipeline.decrypt(encrypted), self.text)
+
+    def test_pipeline_without_numpy(self):
+        # Load a separate copy of pipeline.py as if NumPy were not installed
+        spec = importlib.util.spec_from_file_location('pipeline_without_numpy',
+                                                      os.path.join(os.path.dirname(__file__), 'pipeline.py'))
+        module = importlib.util.module_from_spec(spec)
+        with mock.patch('encrypt.np', None):
+            spec.loader.exec_module(module)
+        self.assertIsNone(module.np)
+
+        stages = [CaesarCipher('', 3), VigenereCipher('', 'KEY'), XORCipher('', 'gvsu')]
+        pipeline = module.CipherPipeline(stages)
+        self.assertEqual(pipeline.pass_count, 1)
+        self.assertEqual(pipeline.encrypt(self.text), self.chain(stages, self.text))
+
+    def test_pipeline_splits_long_periods(self):
+        stages = [VigenereCipher('', 'abc'), XORCipher('', 'gvsu'), CaesarCipher('', 5)]
+        pipeline = CipherPipeline(stages, max_fused_period=4)
+        self.assertEqual(pipeline.pass_count, 2)
+        self.assertEqual(pipeline.encrypt(self.text), self.chain(stages, self.text))
+
+        with self.assertRaises(TypeError):
+            CipherPipeline(['caesar'])
+        with self.assertRaises(ValueError):
+            CipherPipeline([XORCipher('', '')])
+
+
+class ParallelTests(unittest.TestCase):
+    def setUp(self):
+        self.records = ['Record number ' + str(i) + ', from GVSU!' for i in range(50)]
+
+    def test_make_cipher(self):
+        self.assertEqual(make_cipher(('caesar', 3)).encrypt('HELLO'), 'KHOOR')
+        self.assertEqual(make_cipher('reverse1').encrypt('Hello'), 'olleH')
+
+        with self.assertRaises(ValueError):
+            make_cipher('rot13')
+        with self.assertRaises(TypeError):
+            make_cipher(3)
+
+    def test_encrypt_many_keeps_order(self):
+        for spec in (('vigenere', 'KEY'), XORCipher('', 'gvsu'), 'mapping'):
+            cipher = make_cipher(spec)
+            expected = [cipher.encrypt(record) for record in self.records]
+            encrypted = list(encrypt_many(iter(self.records), spec, workers=2, batch_size=7))
+            self.assertEqual(encrypted, expected)
+            self.assertEqual(list(decrypt_many(encrypted, spec, workers=1)), self.records)
+
+        with self.assertRaises(ValueError):
+            encrypt_many(self.records, 'caesar', workers=0)
+
+    def test_parallel_file_matches_serial_stream(self):
+        text = 'Hello, World — 100€ from GVSU 🎉\r\n' * 400
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'plain.txt')
+            encrypted = os.path.join(directory, 'encrypted.txt')
+            decrypted = os.path.join(directory, 'decrypted.txt')
+            with open(source, 'w', encoding='utf-8', newline='') as file:
+                file.write(text)
+
+            for spec in (('xor', 'gvsu'), ('vigenere', 'KEY'), 'mapping'):
+                cipher = make_cipher(spec)
+                if isinstance(cipher, XORCipher):
+                    serial = io.BytesIO()
+                    cipher.encrypt_stream(io.BytesIO(text.encode('utf-8')), serial)
+                    expected = serial.getvalue()
+                else:
+                    serial = io.StringIO()
+                    cipher.encrypt_stream(io.StringIO(text), serial)
+                    expected = serial.getvalue().encode('utf-8')
+
+                encrypt_file_parallel(source, encrypted, spec, workers=2, chunk_size=1001)
+                with open(encrypted, 'rb') as file:
+                    self.assertEqual(file.read(), expected)
+
+                decrypt_file_parallel(encrypted, decrypted, spec, workers=1, chunk_size=777)
+                with open(decrypted, 'rb') as file:
+                    self.assertEqual(file.read(), text.encode('utf-8'))
+
+            with self.assertRaises(ValueError):
+                encrypt_file_parallel(source, encrypted, 'reverse1', workers=1)
+
+    def test_parallel_file_with_length_changing_letters(self):
+        # Latin-1 letters are shifted onto ASCII letters, so each chunk comes out shorter than it went in
+        text = 'Café crème, Straße und Grüße aus GVSU!\n' * 300
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'plain.txt')
+            encrypted = os.path.join(directory, 'encrypted.txt')
+            with open(source, 'w', encoding='utf-8', newline='') as file:
+                file.write(text)
+
+            for spec in (('caesar', 3), ('vigenere', 'KEY')):
+                serial = io.StringIO()
+                make_cipher(spec).encrypt_stream(io.StringIO(text), serial)
+                encrypt_file_parallel(source, encrypted, spec, workers=2, chunk_size=1001)
+                with open(encrypted, 'rb') as file:
+                    self.assertEqual(file.read(), serial.getvalue().encode('utf-8'))
+
+            # Chunks that keep their length are written in place, without putting the file back together
+            with mock.patch('parallel._join_chunks') as join_chunks:
+                encrypt_file_parallel(source, encrypted, ('xor', 'gvsu'), workers=1, chunk_size=1001)
+            join_chunks.assert_not_called()
+
+            # A failing chunk leaves neither the destination nor any part files behind
+            os.remove(encrypted)
+            with mock.patch('parallel._transform_chunk', side_effect=OSError('disk full')):
+                with self.assertRaises(OSError):
+                    encrypt_file_parallel(source, encrypted, ('caesar', 3), workers=1, chunk_size=1001)
+            self.assertEqual(os.listdir(directory), ['plain.txt'])
+
+
+class ContainerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'records.gvsu')
+        self.records = ['Record ' + str(i) + ': Hello, World — from GVSU!\n' for i in range(100)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_container_random_access(self):
+        with ContainerWriter(self.path, 'vigenere', 'KEY', key_id='2024-key') as writer:
+            self.assertEqual(writer.append(self.records[0]), 0)
+            self.assertEqual(writer.extend(self.records[1:60]), 59)
+            self.assertEqual(writer.extend(self.records[60:], workers=2), 40)
+
+        with ContainerReader(self.path, {'2024-key': 'KEY'}) as reader:
+            self.assertEqual(len(reader), 100)
+            self.assertEqual((reader.cipher_name, reader.key_id), ('vigenere', '2024-key'))
+            self.assertEqual(reader[57], self.records[57])
+            self.assertEqual(reader[-1], self.records[-1])
+            self.assertEqual(reader.raw(3).decode('utf-8'), VigenereCipher(self.records[3], 'KEY').cipher_text)
+            self.assertEqual(list(reader), self.records)
+
+            with self.assertRaises(IndexError):
+                reader[100]
+
+    def test_container_keyless_cipher_and_bad_file(self):
+        with ContainerWriter(self.path, 'mapping') as writer:
+            writer.extend(self.records)
+        with ContainerReader(self.path) as reader:
+            self.assertEqual(reader[10], self.records[10])
+
+        with open(self.path, 'wb') as file:
+            file.write(b'not a container file at all, just some text')
+        with self.assertRaises(ValueError):
+            ContainerReader(self.path)
+        with self.assertRaises(ValueError):
+            ContainerWriter(self.path, 'rot13')
+
+    def test_container_missing_key_and_truncated_index(self):
+        with ContainerWriter(self.path, 'vigenere', 'KEY', key_id='k1') as writer:
+            writer.extend(self.records)
+
+        with self.assertRaises(KeyError):
+            ContainerReader(self.path, {'k2': 'KEY'})
+        with self.assertRaises(ValueError):
+            ContainerReader(self.path)
+
+        # A footer that claims more records than the index holds
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        index_offset, count, end_marker = struct.unpack('<QQ4s', data[-20:])
+        with open(self.path, 'wb') as file:
+            file.write(data[:-20] + struct.pack('<QQ4s', index_offset, count + 1, end_marker))
+        with self.assertRaises(ValueError):
+            ContainerReader(self.path, 'KEY')
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class CryptanalysisTests(unittest.TestCase):
+    def setUp(self):
+        self.text = ('Four score and seven years ago our fathers brought forth on this continent, a new nation, '
+                     'conceived in Liberty, and dedicated to the proposition that all men are created equal. '
+                     'Now we are engaged in a great civil war, testing whether that nation, or any nation so '
+                     'conceived and so dedicated, can long endure. We are met on a great battle-field of that war. '
+                     'We have come to dedicate a portion of that field, as a final resting place for those who '
+                     'here gave their lives that that nation might live. It is altogether fitting and proper that '
+                     'we should do this. But, in a larger sense, we can not dedicate -- we can not consecrate -- '
+                     'we can not hallow -- this ground. The brave men, living and dead, who struggled here, have '
+                     'consecrated it, far above our poor power to add or detract. The world will little note, nor '
+                     'long remember what we say here, but it can never forget what they did here. It is for us the '
+                     'living, rather, to be dedicated here to the unfinished work which they who fought here have '
+                     'thus far so nobly advanced. It is rather for us to be here dedicated to the great task '
+                     'remaining before us -- that from these honored dead we take increased devotion to that cause '
+                     'for which they gave the last full measure of devotion -- that we here highly resolve that '
+                     'these dead shall not have died in vain -- that this nation, under God, shall have a new birth '
+                     'of freedom -- and that government of the people, by the people, for the people, shall not '
+                     'perish from the earth.')
+
+    def test_crack_caesar(self):
+        for key in (0, 3, 13, 25):
+            ranking = crack_caesar(CaesarCipher(self.text, key).cipher_text)
+            self.assertEqual(ranking[0][0], key)
+            self.assertEqual(len(ranking), 26)
+
+        self.assertEqual(crack_caesar(CaesarCipher(self.text, 29).cipher_text)[0][0], 3)
+        with self.assertRaises(ValueError):
+            crack_caesar('1234 !?')
+
+    def test_crack_vigenere(self):
+        for key in ('lemon', 'gvsu', 'lakers'):
+            cipher_text = VigenereCipher(self.text, key).cipher_text
+            self.assertEqual(estimate_vigenere_key_length(cipher_text), len(key))
+            self.assertEqual(crack_vigenere(cipher_text), key)
+
+        cipher_text = VigenereCipher(self.text, '2024').cipher_text
+        self.assertEqual(crack_vigenere(cipher_text, digits=True), '2024')
+        self.assertEqual(crack_vigenere(cipher_text, key_length=4), 'cace')
+
+    def test_crack_xor(self):
+        data = self.text.encode('utf-8')
+        for key in ('gvsu', 'lakers', 'Grand Valley'):
+            xor1 = XORCipher('', key)
+            self.assertEqual(crack_xor(xor1.xor_bytes(data)), key.encode('utf-8'))
+
+        self.assertEqual(crack_xor(XORCipher(self.text, 'gvsu').cipher_text), b'gvsu')
+
+    def test_solve_substitution(self):
+        cipher_text = CustomMappingCipher(self.text).cipher_text
+        mapping, score = solve_substitution(cipher_text, restarts=2, workers=2, seed=0)
+        plain_text = cipher_text.translate(str.maketrans(mapping))
+
+        matches = sum(plain == original for plain, original in zip(plain_text, self.text))
+        self.assertEqual(len(plain_text), len(self.text))
+        self.assertGreater(matches / len(self.text), 0.95)
+        self.assertLess(score, 0)
+        self.assertRaises(ValueError, solve_substitution, cipher_text, restarts=0)
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class SweepTests(unittest.TestCase):
+    def setUp(self):
+        self.text = 'Grand Valley State — Allendale, MI 49401 🎉'
+
+    def test_sweep_caesar(self):
+        keys = list(range(-30, 30))
+        self.assertEqual(list(sweep(self.text, keys)), [CaesarCipher(self.text, key).cipher_text for key in keys])
+        self.assertEqual(list(sweep(self.text, keys, decrypt=True)),
+                         [CaesarCipher('', key).decrypt(self.text) for key in keys])
+
+        # Sweeping reads every table without counting towards the cache statistics
+        stats = caesar_table_stats()
+        sweep(self.text, keys)
+        self.assertEqual(caesar_table_stats(), stats)
+
+    def test_sweep_vigenere(self):
+        keys = ['a', 'key', 'LEMON', 'k3y', 'lakers', 'gvsu']
+        result = sweep(self.text, keys, 'vigenere')
+        self.assertEqual(len(result), len(keys))
+        self.assertEqual(result.array.shape, (len(keys), len(self.text)))
+        self.assertEqual(dict(result.items()), {key: VigenereCipher(self.text, key).cipher_text for key in keys})
+        self.assertEqual(list(sweep('ascii only', keys, 'vigenere', decrypt=True)),
+                         [VigenereCipher('', key).decrypt('ascii only') for key in keys])
+
+    def test_sweep_xor(self):
+        keys = ['a', 'key', 'ü€', '🎉x']
+        self.assertEqual(list(sweep(self.text, keys, 'xor')), [XORCipher(self.text, key).cipher_text for key in keys])
+
+        data = self.text.encode('utf-8')
+        self.assertEqual(list(sweep(data, keys, 'xor')), [XORCipher('', key).xor_bytes(data) for key in keys])
+
+    def test_sweep_errors(self):
+        self.assertRaises(ValueError, sweep, self.text, [1], 'salting')
+        self.assertRaises(TypeError, sweep, self.text, ['1'])
+        self.assertRaises(ValueError, sweep, self.text, [''], 'vigenere')
+        self.assertRaises(TypeError, sweep, b'bytes', [1])
+
+        for cipher in ('caesar', 'vigenere', 'xor'):
+            result = sweep(self.text, [], cipher)
+            self.assertEqual(len(result), 0)
+            self.assertEqual(list(result), [])
+
+
+class CommandLineTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.text = 'Hello, Students\r\nGo Lakers — 🎉\n' * 50
+        self.source = self.path('plain.txt')
+        with open(self.source, 'w', encoding='utf-8', newline='') as file:
+            file.write(self.text)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def run_main(self, argv, stdin=b''):
+        stdout = io.TextIOWrapper(io.BytesIO())
+        stderr = io.StringIO()
+        with mock.patch('sys.stdin', io.TextIOWrapper(io.BytesIO(stdin))), mock.patch('sys.stdout', stdout), \
+                contextlib.redirect_stderr(stderr):
+            status = main(argv)
+        return status, stdout.buffer.getvalue(), stderr.getvalue()
+
+    def test_files_round_trip_for_every_cipher(self):
+        for argv in (['salting', '-k', 'gvsu'], ['reverse1'], ['reverse2'], ['xor', '-k', 'gvsu'],
+                     ['caesar', '-k', '3'], ['vigenere', '--key', 'lakers'], ['mapping']):
+            encrypted, decrypted = self.path('encrypted'), self.path('decrypted')
+            status, output, report = self.run_main(argv + [self.source, '-o', encrypted, '--chunk-size', '7'])
+            self.assertEqual(status, 0)
+            self.assertRegex(report, r'^encrypted [0-9.]+ MB in [0-9.]+ s \([0-9.]+ MB/s\), peak RSS ')
+
+            self.run_main(argv + [encrypted, '-o', decrypted, '-d', '-q'])
+            with open(decrypted, encoding='utf-8', newline='') as file:
+                self.assertEqual(file.read(), self.text, argv[0])
+
+    def test_standard_input_and_output(self):
+        status, output, report = self.run_main(['vigenere', '-k', 'gvsu', '-q'], self.text.encode('utf-8'))
+        self.assertEqual(status, 0)
+        self.assertEqual(report, '')
+        self.assertEqual(output.decode('utf-8'), VigenereCipher(self.text, 'gvsu').cipher_text)
+
+        status, output, report = self.run_main(['vigenere', '-k', 'gvsu', '-d', '-q'], output)
+        self.assertEqual(output.decode('utf-8'), self.text)
+
+        status, output, report = self.run_main(['xor', '-k', 'gvsu', '-q'], self.text.encode('utf-8'))
+        self.assertEqual(output, XORCipher('', 'gvsu').xor_bytes(self.text.encode('utf-8')))
+
+    def test_workers_match_serial(self):
+        serial, parallel = self.path('serial'), self.path('parallel')
+        self.run_main(['vigenere', '-k', 'gvsu', self.source, '-o', serial, '-q'])
+        status, output, report = self.run_main(['vigenere', '-k', 'gvsu', self.source, '-o', parallel, '-q',
+                                                '-w', '2', '--chunk-size', '100'])
+        self.assertEqual(status, 0)
+        with open(serial, 'rb') as first, open(parallel, 'rb') as second:
+            self.assertEqual(first.read(), second.read())
+
+    def test_bad_arguments(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            for argv in (['caesar'], ['caesar', '-k', 'three'], ['mapping', '-k', 'gvsu'],
+                         ['xor', '-k', 'a', '-w', '2'], ['rot13']):
+                with self.assertRaises(SystemExit):
+                    main(argv)
+
+        status, output, report = self.run_main(['salting', '-k', 'a', self.source, '-o', self.path('out'), '-w', '2'])
+        self.assertEqual(status, 1)
+        self.assertIn('cannot encrypt a file in chunks', report)
+
+    def test_same_input_and_output(self):
+        same = os.path.join(self.directory.name, '.', 'plain.txt')
+        for argv in (['caesar', '-k', '3'], ['reverse1'], ['xor', '-k', 'gvsu', '-w', '2']):
+            with contextlib.redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+                main(argv + [self.source, '-o', same])
+            self.assertIn('input and output must be different files', stderr.getvalue())
+
+        with open(self.source, encoding='utf-8', newline='') as file:
+            self.assertEqual(file.read(), self.text)
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_run_suite_names_every_timing(self):
+        reports = []
+        results = run_suite(['caesar', 'reverse1'], [100], repeat=1, report=lambda *report: reports.append(report))
+        self.assertEqual(len(results['results']), 8)
+        self.assertIn('reverse1/decrypt/unicode/100', results['results'])
+        self.assertEqual([name for name, seconds, speed in reports], list(results['results']))
+        self.assertTrue(all(seconds > 0 for seconds in results['results'].values()))
+
+    def test_compare_finds_regressions(self):
+        baseline = {'results': {'a': 1.0, 'b': 1.0, 'c': 1.0, 'gone': 1.0}}
+        results = {'results': {'a': 1.05, 'b': 1.5, 'c': 2.0, 'new': 9.0}}
+        self.assertEqual(compare(results, baseline), [('c', 1.0, 2.0), ('b', 1.0, 1.5)])
+        self.assertEqual(compare(results, baseline, tolerance=1.0), [])
+
+    def test_main_fails_against_a_faster_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            arguments = ['--ciphers', 'caesar', '--sizes', '100', '--mixes', 'ascii', '--repeat', '1']
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(benchmark_main(arguments + ['--output', output]), 0)
+
+            with open(output) as file:
+                results = json.load(file)
+            self.assertEqual(sorted(results['results']), ['caesar/decrypt/ascii/100', 'caesar/encrypt/ascii/100'])
+
+            # A baseline that is ten times faster should always fail
+            for name in results['results']:
+                results['results'][name] /= 10
+            baseline = os.path.join(directory, 'baseline.json')
+            with open(baseline, 'w') as file:
+                json.dump(results, file)
+
+            stderr = io.StringIO()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+                self.assertEqual(benchmark_main(arguments + ['--baseline', baseline]), 1)
+            self.assertIn('REGRESSION caesar/encrypt/ascii/100', stderr.getvalue())
+
+
+class AioTests(unittest.TestCase):
+    async def echo(self, reader, writer):
+        while True:
+            data = await reader.read(7)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    def test_encrypted_echo_round_trip(self):
+        async def run(cipher_spec):
+            server = await start_encrypted_server(self.echo, '127.0.0.1', 0, cipher_spec)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await open_encrypted_connection('127.0.0.1', port, cipher_spec)
+                # Odd sized writes and reads move the key position around
+                for piece in (b'Hello, Students\n', 'Go Lakers — 🎉\n'.encode('utf-8'), b'abc'):
+                    writer.write(piece)
+                await writer.drain()
+                writer.write_eof()
+
+                lines = [await reader.readline(), await reader.readexactly(5), await reader.read()]
+                writer.close()
+                await writer.wait_closed()
+                return lines
+
+        for cipher_spec in (('xor', 'gvsu'), ('vigenere', 'lakers'), ('caesar', 3)):
+            self.assertEqual(asyncio.run(run(cipher_spec)),
+                             [b'Hello, Students\n', b'Go La', 'kers — 🎉\nabc'.encode('utf-8')], cipher_spec)
+
+    def test_traffic_is_encrypted_with_the_key_position_carried_on(self):
+        async def run(cipher_spec):
+            received = []
+
+            async def record(reader, writer):
+                received.append(await reader.read())
+                writer.close()
+
+            server = await asyncio.start_server(record, '127.0.0.1', 0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await open_encrypted_connection('127.0.0.1', port, cipher_spec)
+                writer.writelines([b'Hello, ', b'Students'])
+                writer.write(b'!')
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+                while not received:
+                    await asyncio.sleep(0.01)
+            return received[0]
+
+        self.assertEqual(asyncio.run(run(('xor', 'gvsu'))), XORCipher('', 'gvsu').xor_bytes(b'Hello, Students!'))
+        self.assertEqual(asyncio.run(run(('vigenere', 'gvsu'))),
+                         VigenereCipher('Hello, Students!', 'gvsu').cipher_text.encode('ascii'))
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run(('salting', 'gvsu')))
+
+    def test_benchmark_echo(self):
+        result = asyncio.run(benchmark_echo(('xor', 'gvsu'), connections=5, messages=3, message_size=100))
+        self.assertEqual(result['messages'], 15)
+        self.assertGreater(result['megabytes_per_second'], 0)
+        self.assertLessEqual(result['latency_p50_ms'], result['latency_p99_ms'])
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'metrics.json')
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.stop_dump()
+        metrics.disable()
+        metrics.reset()
+        self.directory.cleanup()
+
+    def test_counts_calls_and_characters(self):
+        original = XORCipher.__dict__['decrypt']
+        metrics.enable()
+        self.assertTrue(metrics.is_enabled())
+        self.assertIsNot(XORCipher.__dict__['decrypt'], original)
+
+        cipher = XORCipher('Hello, Students!', 'gvsu')
+        self.assertEqual(cipher.decrypt(cipher.cipher_text), 'Hello, Students!')
+        CaesarCipher('Hello', 3)
+        CaesarCipher('Hi', 3)
+
+        stats = metrics.snapshot()
+        # XORCipher.decrypt calls encrypt, which only counts as the one decrypt call
+        self.assertEqual(stats['XORCipher']['encrypt']['calls'], 1)
+        self.assertEqual(stats['XORCipher']['decrypt']['calls'], 1)
+        self.assertEqual(stats['XORCipher']['decrypt']['characters'], 16)
+        self.assertEqual(stats['CaesarCipher']['encrypt']['calls'], 2)
+        self.assertEqual(stats['CaesarCipher']['encrypt']['characters'], 7)
+        self.assertNotIn('decrypt', stats['CaesarCipher'])
+        self.assertLessEqual(stats['CaesarCipher']['encrypt']['p50_ms'], stats['CaesarCipher']['encrypt']['p99_ms'])
+
+        metrics.disable()
+        self.assertFalse(metrics.is_enabled())
+        self.assertIs(XORCipher.__dict__['decrypt'], original)
+        CaesarCipher('Hello', 3)
+        self.assertEqual(metrics.snapshot()['CaesarCipher']['encrypt']['calls'], 2)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_methods_looked_up_while_enabled(self):
+        metrics.enable()
+        pipeline = CipherPipeline([CaesarCipher('', 3)])
+        metrics.reset()
+        pipeline.encrypt('hello')
+        self.assertEqual(metrics.snapshot()['CaesarCipher']['encrypt']['calls'], 1)
+
+        metrics.disable()
+        metrics.reset()
+        self.assertEqual(pipeline.encrypt('hello'), 'khoor')
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_dump(self):
+        metrics.enable()
+        VigenereCipher('Hello', 'gvsu')
+        metrics.dump(self.path)
+        with open(self.path) as file:
+            data = json.load(file)
+        self.assertTrue(data['enabled'])
+        self.assertEqual(data['ciphers']['VigenereCipher']['encrypt']['calls'], 1)
+
+        with self.assertRaises(ValueError):
+            metrics.start_dump(self.path, 0)
 
+        os.remove(self.path)
+        metrics.start_dump(self.path, 0.01)
+        for _ in range(500):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.01)
+        metrics.stop_dump()
+        self.assertTrue(os.path.exists(self.path))